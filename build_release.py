@@ -5,67 +5,174 @@
 方案：先将 .py 预编译为 .pyc，然后将 .pyc 放入 src 目录供 PyInstaller 打包。
 
 使用方式：
-    python build_release.py
+    python build_release.py           # 增量构建（复用 build/ 分析缓存）
+    python build_release.py --fresh   # 清空 build/ 后完整重建
+    python build_release.py --spec a.spec --spec b.spec   # 并行打包多个变体
+    python build_release.py --opt     # 优化模式（去除 assert；--opt 2 另去除 docstring）
 """
 import os
 import sys
+import argparse
 import shutil
 import subprocess
-import py_compile
 import compileall
+import tarfile
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 SRC_PKG = os.path.join(PROJECT_ROOT, "src", "novel_translator")
 BUILD_SRC = os.path.join(PROJECT_ROOT, "_build_src", "novel_translator")
+# PyInstaller 工作目录与配置/缓存目录，跨构建保留以复用依赖分析结果
+PYI_WORK_DIR = os.path.join(PROJECT_ROOT, "build")
+PYI_CONFIG_DIR = os.path.join(PROJECT_ROOT, ".pyinstaller_cache")
+# 已压缩或二进制格式，DEFLATE 几乎无收益，直接存储
+STORED_EXTS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+    ".zip", ".gz", ".7z", ".pyd", ".dll", ".so", ".exe",
+    ".woff", ".woff2", ".ttf", ".otf",
+}
+_print_lock = threading.Lock()
 
 
 def step(msg):
     print(f"\n{'='*60}\n  {msg}\n{'='*60}")
 
 
-def precompile_sources():
-    """将 src/novel_translator/*.py 预编译为 _build_src/novel_translator/*.pyc"""
+def precompile_sources(optimize: int = 0):
+    """将 src/novel_translator/*.py 预编译为 _build_src/novel_translator/*.pyc
+
+    optimize=1 去除 assert，optimize=2 额外去除 docstring（等价于 python -O / -OO）。
+    """
     step("Step 1: 预编译 Python 源文件为 .pyc")
 
     if os.path.exists(BUILD_SRC):
         shutil.rmtree(BUILD_SRC)
     os.makedirs(BUILD_SRC)
 
-    for fname in os.listdir(SRC_PKG):
-        if not fname.endswith(".py"):
-            continue
-        src_path = os.path.join(SRC_PKG, fname)
-        # 同时复制 .py 原文件（用于 PyInstaller 分析）和 .pyc
-        shutil.copy2(src_path, os.path.join(BUILD_SRC, fname))
-        pyc_path = os.path.join(BUILD_SRC, fname + "c")
-        py_compile.compile(src_path, pyc_path, doraise=True)
+    copied = []
+    with os.scandir(SRC_PKG) as it:
+        for entry in it:
+            if not entry.name.endswith(".py") or not entry.is_file():
+                continue
+            # 同时复制 .py 原文件（用于 PyInstaller 分析）和 .pyc；
+            # 构建产物无需保留元数据，copyfile 省去每个文件的 stat/utime
+            shutil.copyfile(entry.path, os.path.join(BUILD_SRC, entry.name))
+            copied.append(entry.name)
+
+    # 单次 compileall 调用：legacy=True 将 foo.pyc 写在 foo.py 旁边，workers=0 使用全部 CPU
+    # 优化级别不体现在文件名中：legacy 布局下始终为 foo.pyc
+    ok = compileall.compile_dir(
+        BUILD_SRC, maxlevels=0, legacy=True, quiet=1, workers=0, optimize=optimize
+    )
+    if not ok:
+        print("\n  [ERROR] 预编译失败！")
+        sys.exit(1)
+    for fname in sorted(copied):
         print(f"  [OK] {fname} -> {fname}c")
 
     print(f"\n  预编译完成，输出目录: {BUILD_SRC}")
 
 
-def run_pyinstaller():
-    """执行 PyInstaller 打包"""
-    step("Step 2: PyInstaller 打包")
-
-    spec_file = os.path.join(PROJECT_ROOT, "novel_translator.spec")
-    env = os.environ.copy()
-    env["PYTHONUTF8"] = "1"
-    env["PYTHONIOENCODING"] = "utf-8"
-    # 将预编译的包目录加入 PYTHONPATH
-    env["PYTHONPATH"] = os.path.join(PROJECT_ROOT, "_build_src") + os.pathsep + env.get("PYTHONPATH", "")
-
-    result = subprocess.run(
-        [sys.executable, "-m", "PyInstaller", spec_file, "--noconfirm"],
+def _run_one_spec(spec_file, env, prefix=""):
+    """运行单个 spec 的 PyInstaller，逐行转发输出，返回退出码"""
+    # 逐行转发 PyInstaller 输出，实时查看进度且不在内存中累积日志
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "PyInstaller", spec_file, "--noconfirm", "--workpath", PYI_WORK_DIR],
         cwd=PROJECT_ROOT,
         env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
     )
-    if result.returncode != 0:
-        print("\n  [ERROR] PyInstaller 打包失败！")
+    for line in proc.stdout:
+        with _print_lock:
+            sys.stdout.write(prefix + line)
+            sys.stdout.flush()
+    return proc.wait()
+
+
+def run_pyinstaller(specs=None, fresh: bool = False, optimize: int = 0):
+    """执行 PyInstaller 打包
+
+    默认保留 build/ 工作目录且不传 --clean，后续构建可跳过依赖图重新分析；
+    fresh=True 时先清空 build/ 再完整打包。
+    optimize>0 时设置 PYTHONOPTIMIZE，PyInstaller 以对应优化级别编译打包的模块。
+    传入多个 spec 时并行执行，每个 spec 使用独立的 PYINSTALLER_CONFIG_DIR
+    （工作目录由 PyInstaller 按 spec 名自动区分）。
+    """
+    step("Step 2: PyInstaller 打包")
+
+    if fresh:
+        print("  [INFO] --fresh: 清空 PyInstaller 工作目录")
+        shutil.rmtree(PYI_WORK_DIR, ignore_errors=True)
+
+    specs = specs or [os.path.join(PROJECT_ROOT, "novel_translator.spec")]
+    base_env = os.environ.copy()
+    base_env["PYTHONUTF8"] = "1"
+    base_env["PYTHONIOENCODING"] = "utf-8"
+    if optimize:
+        base_env["PYTHONOPTIMIZE"] = str(optimize)
+    # 将预编译的包目录加入 PYTHONPATH
+    base_env["PYTHONPATH"] = os.path.join(PROJECT_ROOT, "_build_src") + os.pathsep + base_env.get("PYTHONPATH", "")
+
+    jobs = []
+    for spec_file in specs:
+        spec_name = os.path.splitext(os.path.basename(spec_file))[0]
+        env = dict(base_env)
+        env["PYINSTALLER_CONFIG_DIR"] = os.path.join(PYI_CONFIG_DIR, spec_name)
+        prefix = f"[{spec_name}] " if len(specs) > 1 else ""
+        jobs.append((spec_name, spec_file, env, prefix))
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {
+            executor.submit(_run_one_spec, spec_file, env, prefix): spec_name
+            for spec_name, spec_file, env, prefix in jobs
+        }
+        for future in as_completed(futures):
+            if future.result() != 0:
+                failed.append(futures[future])
+
+    if failed:
+        print(f"\n  [ERROR] PyInstaller 打包失败！({', '.join(failed)})")
         sys.exit(1)
     print("\n  [OK] 打包完成")
 
 
+def write_zip(zip_path, root_dir):
+    """流式写入 zip：已压缩格式使用 ZIP_STORED，其余使用 ZIP_DEFLATED"""
+    with zipfile.ZipFile(zip_path, "w", allowZip64=True) as zf:
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            dirnames.sort()
+            for fname in sorted(filenames):
+                path = os.path.join(dirpath, fname)
+                arcname = os.path.relpath(path, root_dir)
+                ext = os.path.splitext(fname)[1].lower()
+                if ext in STORED_EXTS:
+                    zf.write(path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(path, arcname, compress_type=zipfile.ZIP_DEFLATED, compresslevel=6)
+
+
+def write_tar_zst(archive_path, root_dir, arcname):
+    """使用 zstandard 流式生成 .tar.zst（未安装 zstandard 时跳过，返回 False）"""
+    try:
+        import zstandard as zstd
+    except ImportError:
+        print("  [SKIP] 未安装 zstandard，跳过 .tar.zst（pip install zstandard）")
+        return False
+    cctx = zstd.ZstdCompressor(level=10, threads=-1)
+    with open(archive_path, "wb") as out, cctx.stream_writer(out) as compressor:
+        with tarfile.open(fileobj=compressor, mode="w|") as tar:
+            tar.add(root_dir, arcname=arcname)
+    return True
+
+
 def create_release_zip():
     """创建发行压缩包"""
     step("Step 3: 创建发行压缩包")
@@ -87,14 +194,20 @@ def create_release_zip():
 
     # 创建 zip
     zip_name = "NovelTranslator-win-x64"
-    zip_path = os.path.join(PROJECT_ROOT, "dist", zip_name)
-    shutil.make_archive(zip_path, "zip", dist_dir)
+    final_zip = os.path.join(PROJECT_ROOT, "dist", zip_name + ".zip")
+    write_zip(final_zip, dist_dir)
 
-    final_zip = zip_path + ".zip"
     size_mb = os.path.getsize(final_zip) / 1024 / 1024
     print(f"  [OK] 发行包: {final_zip}")
     print(f"  [OK] 大小: {size_mb:.1f} MB")
 
+    # 额外生成体积更小的 .tar.zst（zip 保留给直接双击解压的 Windows 用户）
+    final_zst = os.path.join(PROJECT_ROOT, "dist", zip_name + ".tar.zst")
+    if write_tar_zst(final_zst, dist_dir, "NovelTranslator"):
+        size_mb = os.path.getsize(final_zst) / 1024 / 1024
+        print(f"  [OK] 发行包: {final_zst}")
+        print(f"  [OK] 大小: {size_mb:.1f} MB")
+
 
 def cleanup():
     """清理临时文件"""
@@ -103,13 +216,26 @@ def cleanup():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Novel Translator 发行包构建脚本")
+    parser.add_argument("--fresh", action="store_true", help="清空 build/ 工作目录后完整重建")
+    parser.add_argument(
+        "--opt", type=int, nargs="?", const=1, default=0, choices=[0, 1, 2],
+        help="以优化模式编译（1=去除 assert，2=另去除 docstring），调试构建请勿使用",
+    )
+    parser.add_argument(
+        "--spec", action="append", default=None,
+        help="要打包的 spec 文件，可重复指定以并行构建多个变体（默认 novel_translator.spec）",
+    )
+    args = parser.parse_args()
+
     print("Novel Translator — 构建发行包")
     print(f"Python: {sys.version}")
     print(f"项目目录: {PROJECT_ROOT}")
 
     try:
-        precompile_sources()
-        run_pyinstaller()
+        precompile_sources(optimize=args.opt)
+        specs = [os.path.abspath(p) for p in args.spec] if args.spec else None
+        run_pyinstaller(specs, fresh=args.fresh, optimize=args.opt)
         create_release_zip()
     finally:
         cleanup()
@@ -25,7 +25,7 @@ else:
     if src_dir not in sys.path:
         sys.path.insert(0, src_dir)
 
-from novel_translator.gui import run_gui
-
 if __name__ == "__main__":
+    # 延迟导入：GUI 依赖（flet/ebooklib/bs4 等）仅在真正启动时加载
+    from novel_translator.gui import run_gui
     run_gui()
@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 import sys
@@ -19,6 +20,8 @@ if not API_KEY:
 INPUT_FILE = r"E:\Download\jp.絮叨的我和冷淡的你.epub"
 OUTPUT_FILE = os.path.join(ROOT, "audit_beta_first3_output.txt")
 AUDIT_FILE = os.path.join(ROOT, "audit_beta_first3_model_io.json")
+# 逐条追加的模型 I/O 记录（JSONL），进程中断时已写入的记录不会丢失
+AUDIT_JSONL = os.path.splitext(AUDIT_FILE)[0] + ".jsonl"
 
 cfg = TranslationConfig(
     provider="openai",
@@ -51,18 +54,34 @@ cfg = TranslationConfig(
 )
 
 engine = TranslatorEngine(cfg)
-model_io = []
+model_io_count = 0
+_audit_fp = open(AUDIT_JSONL, "w", encoding="utf-8", buffering=1)
+
+
+def _write_record(record: dict):
+    global model_io_count
+    _audit_fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+    _audit_fp.flush()
+    model_io_count += 1
+
+
+_HASH_CHUNK = 65536
 
 
 def _sha256(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+    # 分片编码后增量更新，避免为超长提示词一次性生成完整 UTF-8 副本
+    h = hashlib.new("sha256", usedforsecurity=False)
+    for i in range(0, len(text), _HASH_CHUNK):
+        h.update(text[i:i + _HASH_CHUNK].encode("utf-8", errors="ignore"))
+    return h.hexdigest()
 
 
 def _preview(text: str, limit: int = 600) -> str:
     if not text:
         return ""
-    t = text.replace("\r\n", "\n").replace("\r", "\n")
-    return t[:limit]
+    # 先截取再规范换行：每个输出字符至多对应 2 个原始字符（\r\n），取 2*limit 足够
+    head = text[:limit * 2]
+    return head.replace("\r\n", "\n").replace("\r", "\n")[:limit]
 
 
 orig_init_provider = engine._init_provider
@@ -70,7 +89,12 @@ orig_init_provider = engine._init_provider
 
 def patched_init_provider():
     orig_init_provider()
-    original_translate = engine.provider.translate
+    # 配置未变时引擎会沿用上次的 Provider（已包装过），不再重复套一层
+    if getattr(engine.provider, "_audit_traced", False):
+        return
+    # 在副本上替换 translate，不改动 create_provider 返回的实例
+    provider = copy.copy(engine.provider)
+    original_translate = provider.translate
 
     def traced_translate(system_prompt, user_content, assistant_prefix=None, **kwargs):
         record = {
@@ -90,14 +114,16 @@ def patched_init_provider():
             )
             record["output_len"] = len(out or "")
             record["output_preview"] = _preview(out or "", 1200)
-            model_io.append(record)
+            _write_record(record)
             return out
         except Exception as exc:
             record["error"] = str(exc)
-            model_io.append(record)
+            _write_record(record)
             raise
 
-    engine.provider.translate = traced_translate
+    provider.translate = traced_translate
+    provider._audit_traced = True
+    engine.provider = provider
 
 
 engine._init_provider = patched_init_provider
@@ -105,6 +131,7 @@ engine.on_log = lambda msg: print(msg)
 
 thread = engine.start_translation()
 thread.join()
+_audit_fp.close()
 
 output_text = ""
 if os.path.exists(OUTPUT_FILE):
@@ -121,8 +148,8 @@ payload = {
         "use_prefix_completion": cfg.use_prefix_completion,
         "use_fim_completion": cfg.use_fim_completion,
     },
-    "model_io_count": len(model_io),
-    "model_io": model_io,
+    "model_io_count": model_io_count,
+    "model_io_file": AUDIT_JSONL,
     "output_exists": os.path.exists(OUTPUT_FILE),
     "output_len": len(output_text),
     "output_preview": _preview(output_text, 2500),
@@ -132,6 +159,7 @@ with open(AUDIT_FILE, "w", encoding="utf-8") as f:
     json.dump(payload, f, ensure_ascii=False, indent=2)
 
 print(f"AUDIT_FILE={AUDIT_FILE}")
+print(f"AUDIT_JSONL={AUDIT_JSONL}")
 print(f"OUTPUT_FILE={OUTPUT_FILE}")
-print(f"MODEL_IO_COUNT={len(model_io)}")
+print(f"MODEL_IO_COUNT={model_io_count}")
 print(f"OUTPUT_LEN={len(output_text)}")
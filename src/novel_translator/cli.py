@@ -11,20 +11,21 @@ import sys
 import os
 import re
 
-from novel_translator.engine import TranslatorEngine, TranslationConfig
+_XX_PREFIX_RE = re.compile(r"^\s*[A-Za-z0-9]{1,12}[.\-_\s、．。]+")
 
 
 def _strip_leading_xx_prefix(stem: str) -> str:
     """Remove leading short serial prefixes like '01.', 'AB-', 'Vol.1-'."""
     if not stem:
         return stem
-    # Apply repeatedly so patterns like "01.Vol.1-" are handled.
+    # Apply until a fixed point so patterns like "01.Vol.1-" are handled;
+    # every substitution consumes at least one char, so this terminates.
     s = stem.strip()
-    for _ in range(3):
-        new_s = re.sub(r"^\s*[A-Za-z0-9]{1,12}[.\-_\s、．。]+", "", s)
+    while True:
+        new_s = _XX_PREFIX_RE.sub("", s, count=1).strip()
         if new_s == s:
             break
-        s = new_s.strip()
+        s = new_s
     return s or stem
 
 
@@ -72,9 +73,12 @@ def build_parser() -> argparse.ArgumentParser:
     tr.add_argument("--chunk-size", type=int, default=1500, help="分块字符数 (0=整章翻译)")
     tr.add_argument("--context-lines", type=int, default=5, help="前文上下文注入行数 (0=关闭)")
     tr.add_argument("--workers", type=int, default=1, help="并发线程数")
+    tr.add_argument("--chapter-workers", type=int, default=1, help="同时翻译的章节数 (1=逐章顺序翻译)")
+    tr.add_argument("--batch-chapters", type=int, default=1, help="连续短章节合并为一次请求的最大章数 (1=关闭)")
     tr.add_argument("--start", type=int, default=0, help="起始章节 (1-based)")
     tr.add_argument("--end", type=int, default=0, help="结束章节 (0=全部)")
     tr.add_argument("--no-checkpoint", action="store_true", help="禁用断点续传")
+    tr.add_argument("--llm-cache", action="store_true", help="启用跨运行的 LLM 响应缓存 (~/.cache/novel_translator)")
 
     return p
 
@@ -110,6 +114,9 @@ def main():
         sys.exit(0)
 
     # ---- translate 子命令 ----
+    # 延迟导入：引擎依赖 ebooklib/bs4 等重量级模块，--help 等路径无需加载
+    from novel_translator.engine import TranslatorEngine, TranslationConfig
+
     input_file = args.input
     if not os.path.exists(input_file):
         print(f"❌ 输入文件不存在: {input_file}")
@@ -130,6 +137,8 @@ def main():
         chunk_size=args.chunk_size,
         context_lines=args.context_lines,
         concurrent_workers=args.workers,
+        chapter_workers=args.chapter_workers,
+        batch_chapters=args.batch_chapters,
         input_file=input_file,
         output_file=output_file,
         output_format=args.format,
@@ -137,6 +146,7 @@ def main():
         start_chapter=args.start,
         end_chapter=args.end,
         enable_checkpoint=not args.no_checkpoint,
+        enable_llm_cache=args.llm_cache,
     )
 
     engine = TranslatorEngine(cfg)
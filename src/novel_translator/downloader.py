@@ -9,75 +9,297 @@ novel_translator.downloader
 from __future__ import annotations
 
 import os
+import json
+import time
+import hashlib
+import zipfile
+import functools
+from collections import OrderedDict
+from xml.sax.saxutils import escape as xml_escape
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+# BeautifulSoup 仅用于支持任意 CSS 选择器的站点处理器
 from bs4 import BeautifulSoup
-from ebooklib import epub
-from typing import Callable, Dict, Any
+from bs4.element import Tag
+import soupsieve as sv
+from typing import Callable, Dict, Any, Union
 from urllib.parse import urlparse
 
+# ===== HTTP 会话 =====
+# 模块级 Session 复用连接（keep-alive），同一站点的连续抓取免去重复 DNS/TLS 握手；
+# 429/5xx 由适配器按指数退避重试
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
+}
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _new_session()
+
+
+def close():
+    """关闭共享 Session 并释放连接池（主要供测试清理使用）。"""
+    global _SESSION
+    _SESSION.close()
+    _SESSION = _new_session()
+
+
+# ===== HTTP 响应缓存 =====
+# 磁盘缓存：<key>.html 存正文，<key>.meta.json 存 {url, final_url, fetched_at, etag}
+HTTP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "novel_translator", "http")
+HTTP_CACHE_TTL = 24 * 3600  # 秒
+_MEMORY_CACHE_SIZE = 64
+_memory_cache: "OrderedDict[str, tuple[float, str, str]]" = OrderedDict()
+
+
+def _cache_paths(url: str) -> tuple[str, str]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, key)
+    return base + ".html", base + ".meta.json"
+
+
+def _load_disk_cache(url: str) -> tuple[dict, str] | None:
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "r", encoding="utf-8") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+    if meta.get("url") != url:
+        return None
+    return meta, body
+
+
+def _save_disk_cache(url: str, final_url: str, body: str, etag: str = ""):
+    body_path, meta_path = _cache_paths(url)
+    meta = {"url": url, "final_url": final_url, "fetched_at": time.time(), "etag": etag}
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        with open(body_path, "w", encoding="utf-8") as f:
+            f.write(body)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+    except OSError:
+        # 缓存仅为加速，写入失败不影响下载
+        pass
+
+
+def _remember(url: str, fetched_at: float, final_url: str, body: str):
+    _memory_cache[url] = (fetched_at, final_url, body)
+    _memory_cache.move_to_end(url)
+    while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
 
 def _fetch_url(url: str, timeout: int = 15) -> tuple[str, str]:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
-    }
-    r = requests.get(url, headers=headers, timeout=timeout)
+    """获取页面，返回 (final_url, html)。
+
+    先查进程内缓存，再查磁盘缓存（TTL 内直接返回）；
+    磁盘缓存过期但带 ETag 时发送条件请求，304 则沿用缓存正文。
+    """
+    now = time.time()
+    hit = _memory_cache.get(url)
+    if hit and now - hit[0] < HTTP_CACHE_TTL:
+        _memory_cache.move_to_end(url)
+        return hit[1], hit[2]
+
+    cached = _load_disk_cache(url)
+    if cached:
+        meta, body = cached
+        fetched_at = float(meta.get("fetched_at", 0))
+        if now - fetched_at < HTTP_CACHE_TTL:
+            final_url = meta.get("final_url") or url
+            _remember(url, fetched_at, final_url, body)
+            return final_url, body
+
+    headers = HEADERS
+    if cached and cached[0].get("etag"):
+        headers = {**HEADERS, "If-None-Match": cached[0]["etag"]}
+    r = _SESSION.get(url, headers=headers, timeout=timeout)
+
+    if r.status_code == 304 and cached:
+        meta, body = cached
+        final_url = meta.get("final_url") or url
+        _save_disk_cache(url, final_url, body, meta.get("etag", ""))
+        _remember(url, now, final_url, body)
+        return final_url, body
+
     r.encoding = r.apparent_encoding
+    if r.status_code == 200:
+        _save_disk_cache(url, r.url, r.text, r.headers.get("ETag", ""))
+        _remember(url, now, r.url, r.text)
     return r.url, r.text
 
 
+# 常见主内容容器（预编译 XPath，按优先级排列；等价于 article / div[id*=chapter] / ... / section）
+_MAIN_CONTENT_XPATHS = [
+    etree.XPath(xp)
+    for xp in (
+        "//article",
+        "//div[contains(@id, 'chapter')]",
+        "//div[contains(@class, 'chapter')]",
+        "//div[contains(@id, 'content')]",
+        "//div[contains(@class, 'content')]",
+        "//div[contains(@class, 'novel')]",
+        "//section",
+    )
+]
+_TITLE_XPATH = etree.XPath("//title")
+_BODY_XPATH = etree.XPath("//body")
+# 页面已由 requests 解码为 str，统一按 UTF-8 字节交给 libxml2，避免编码声明冲突
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+
 def _extract_main_html(html: str) -> tuple[str, str]:
     """尝试提取页面中的章节主要内容。返回 (title, html_fragment).
 
     优先查找 <article>，其次尝试常见类名，如 "chapter", "content", "novel"，最后回退到 body。
+    直接使用 lxml.html + 预编译 XPath 匹配，不经过 BeautifulSoup。
     """
-    soup = BeautifulSoup(html, "lxml")
-    title_tag = soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else "下载的章节"
+    try:
+        tree = lxml.html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return "下载的章节", html
 
-    # 常见主内容容器
-    selectors = [
-        "article",
-        "div[id*=chapter]",
-        "div[class*=chapter]",
-        "div[id*=content]",
-        "div[class*=content]",
-        "div[class*=novel]",
-        "section",
-    ]
-    for sel in selectors:
-        node = soup.select_one(sel)
-        if node and node.get_text(strip=True):
-            return title, str(node)
+    title_nodes = _TITLE_XPATH(tree)
+    title = title_nodes[0].text_content().strip() if title_nodes else ""
+    title = title or "下载的章节"
+
+    for xp in _MAIN_CONTENT_XPATHS:
+        nodes = xp(tree)
+        if nodes and nodes[0].text_content().strip():
+            return title, lxml.html.tostring(nodes[0], encoding="unicode", with_tail=False)
 
     # 回退到 body
-    body = soup.find("body")
+    body = _BODY_XPATH(tree)
     if body:
-        return title, str(body)
+        return title, lxml.html.tostring(body[0], encoding="unicode", with_tail=False)
 
     return title, html
 
 
-def _html_to_epub(title: str, html_fragment: str, output_path: str):
-    book = epub.EpubBook()
-    book.set_identifier("novel-translator-downloader")
-    book.set_title(title)
-    book.set_language("ja")
-    book.add_author("Downloaded Chapter")
+# ===== 最小 EPUB 写出 =====
+# 单章节 EPUB 无需经过 ebooklib 的完整构建流程，直接按 EPUB 3 结构流式写入 zip
 
-    # 创建一个章节
-    c1 = epub.EpubHtml(title=title, file_name="chapter_1.xhtml", lang="ja")
-    # 包裹为完整 HTML，确保 ebooklib 能处理
-    c1.content = f"<html><head><meta charset=\"utf-8\"></head><body>{html_fragment}</body></html>"
-    book.add_item(c1)
+_CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+_CONTENT_OPF = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="id" version="3.0">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="id">novel-translator-downloader</dc:identifier>
+    <dc:title>{title}</dc:title>
+    <dc:language>ja</dc:language>
+    <dc:creator>Downloaded Chapter</dc:creator>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+    <item id="chapter_1" href="chapter_1.xhtml" media-type="application/xhtml+xml"/>
+  </manifest>
+  <spine toc="ncx">
+    <itemref idref="nav"/>
+    <itemref idref="chapter_1"/>
+  </spine>
+</package>
+"""
 
-    # 基本导航
-    book.toc = (epub.Link("chapter_1.xhtml", title, "chap1"),)
-    book.add_item(epub.EpubNcx())
-    book.add_item(epub.EpubNav())
+_TOC_NCX = """<?xml version="1.0" encoding="utf-8"?>
+<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">
+  <head>
+    <meta name="dtb:uid" content="novel-translator-downloader"/>
+  </head>
+  <docTitle><text>{title}</text></docTitle>
+  <navMap>
+    <navPoint id="chap1"><navLabel><text>{title}</text></navLabel><content src="chapter_1.xhtml"/></navPoint>
+  </navMap>
+</ncx>
+"""
+
+_NAV_XHTML = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="ja" xml:lang="ja">
+<head><title>{title}</title></head>
+<body>
+<nav epub:type="toc" id="id"><h2>{title}</h2><ol><li><a href="chapter_1.xhtml">{title}</a></li></ol></nav>
+</body>
+</html>
+"""
+
+_CHAPTER_XHTML = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" lang="ja" xml:lang="ja">
+<head><meta charset="utf-8"/><title>{title}</title></head>
+<body>{body}</body>
+</html>
+"""
+
+
+def _fragment_to_xhtml(html_fragment: str) -> str:
+    """将 HTML 片段规整为 XHTML（闭合空标签、转义文本），作为 <body> 内容。"""
+    try:
+        doc = lxml.html.document_fromstring(
+            f"<html><body>{html_fragment}</body></html>".encode("utf-8"), parser=_HTML_PARSER
+        )
+    except (etree.ParserError, ValueError):
+        return xml_escape(html_fragment)
+    body = doc.find("body")
+    if body is None:
+        return xml_escape(html_fragment)
+    parts = [xml_escape(body.text or "")]
+    parts.extend(etree.tostring(child, method="xml", encoding="unicode") for child in body)
+    return "".join(parts)
+
+
+def _write_minimal_epub(output_path: str, title: str, body_xhtml: str):
+    """写出单章节 EPUB：mimetype 以 ZIP_STORED 置于首位（EPUB 规范要求），其余 DEFLATE level 1。"""
+    safe_title = xml_escape(title)
+    modified = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    entries = [
+        ("META-INF/container.xml", _CONTAINER_XML),
+        ("EPUB/content.opf", _CONTENT_OPF.format(title=safe_title, modified=modified)),
+        ("EPUB/toc.ncx", _TOC_NCX.format(title=safe_title)),
+        ("EPUB/nav.xhtml", _NAV_XHTML.format(title=safe_title)),
+        ("EPUB/chapter_1.xhtml", _CHAPTER_XHTML.format(title=safe_title, body=body_xhtml)),
+    ]
+    with zipfile.ZipFile(output_path, "w", allowZip64=False) as zf:
+        zf.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        for name, data in entries:
+            zf.writestr(name, data.encode("utf-8"), compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
 
-    book.spine = ["nav", c1]
 
-    epub.write_epub(output_path, book)
+def _html_to_epub(title: str, html_fragment: Union[str, Tag], output_path: str):
+    if not isinstance(html_fragment, str):
+        html_fragment = html_fragment.decode(formatter="minimal")
+    _write_minimal_epub(output_path, title, _fragment_to_xhtml(html_fragment))
 
 
 def download_url_to_epub(url: str, output_epub: str) -> str:
@@ -85,12 +307,59 @@ def download_url_to_epub(url: str, output_epub: str) -> str:
     final_url, html = _fetch_url(url)
     title, fragment = _extract_main_html(html)
     out_dir = os.path.dirname(output_epub)
-    if out_dir and not os.path.exists(out_dir):
+    if out_dir:
         os.makedirs(out_dir, exist_ok=True)
     _html_to_epub(title, fragment, output_epub)
     return output_epub
 
 
+# ===== CSS 选择器编译缓存 =====
+# 正文选择器优先级（针对 Novelia 镜像常见结构），模块加载时预编译
+_NOVELIA_SELECTORS = [
+    sv.compile(s)
+    for s in (
+        "div.chapter-content",
+        "div#chapter-content",
+        "div#novel_honbun",
+        "div[class*=chapter]",
+        "div[class*=content]",
+        "article",
+        "div.entry-content",
+    )
+]
+# 与 _MAIN_CONTENT_XPATHS 等价的 CSS 版本：站点处理器已有 soup 时回退提取不再重新解析页面
+_MAIN_CONTENT_SELECTORS = [
+    sv.compile(s)
+    for s in (
+        "article",
+        "div[id*=chapter]",
+        "div[class*=chapter]",
+        "div[id*=content]",
+        "div[class*=content]",
+        "div[class*=novel]",
+        "section",
+    )
+]
+
+
+def _extract_main_soup(soup: BeautifulSoup) -> tuple[str, Union[str, Tag]]:
+    """_extract_main_html 的 BeautifulSoup 版本，供已解析页面的站点处理器回退使用"""
+    title_tag = soup.find("title")
+    title = (title_tag.get_text().strip() if title_tag else "") or "下载的章节"
+    for compiled in _MAIN_CONTENT_SELECTORS:
+        node = compiled.select_one(soup)
+        if node and node.get_text().strip():
+            return title, node
+    body = soup.find("body")
+    return title, body if body is not None else str(soup)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_selector(selector: str):
+    """编译用户提供的 CSS 选择器（批量抓取时同一选择器只编译一次）"""
+    return sv.compile(selector)
+
+
 # ===== 站点处理器注册 =====
 SITE_HANDLERS: Dict[str, Callable[[str, str, Dict[str, Any]], str]] = {}
 
@@ -133,22 +402,23 @@ def download_with_site(site_key: str, url: str, output_epub: str, options: Dict[
     selector = opts.get("selector")
     title_selector = opts.get("title_selector")
 
-    final_url, html = _fetch_url(url)
     if selector or title_selector:
+        final_url, html = _fetch_url(url)
+        # 自定义 CSS 选择器依赖 BeautifulSoup；回退的默认提取复用同一 soup
         soup = BeautifulSoup(html, "lxml")
         title = None
         fragment = None
         if title_selector:
-            tnode = soup.select_one(title_selector)
+            tnode = _compile_selector(title_selector).select_one(soup)
             if tnode:
                 title = tnode.get_text(strip=True)
         if selector:
-            node = soup.select_one(selector)
+            node = _compile_selector(selector).select_one(soup)
             if node and node.get_text(strip=True):
-                fragment = str(node)
-        if not fragment:
+                fragment = node
+        if fragment is None:
             # 回退到默认提取
-            title, fragment = _extract_main_html(html)
+            title, fragment = _extract_main_soup(soup)
         else:
             if not title:
                 title_tag = soup.find("title")
@@ -180,7 +450,7 @@ def _novelia_handler(url: str, output_epub: str, options: Dict[str, Any]) -> str
     # 标题
     title = None
     if title_sel:
-        tnode = soup.select_one(title_sel)
+        tnode = _compile_selector(title_sel).select_one(soup)
         if tnode:
             title = tnode.get_text(strip=True)
     if not title:
@@ -191,29 +461,18 @@ def _novelia_handler(url: str, output_epub: str, options: Dict[str, Any]) -> str
         title_tag = soup.find("title")
         title = title_tag.get_text(strip=True) if title_tag else "下载的章节"
 
-    # 正文选择器优先级（针对 Novelia 镜像常见结构）
-    selectors = [
-        sel,
-        "div.chapter-content",
-        "div#chapter-content",
-        "div#novel_honbun",
-        "div[class*=chapter]",
-        "div[class*=content]",
-        "article",
-        "div.entry-content",
-    ]
+    # 用户选择器优先，其后为预编译的站点选择器
+    selectors = ([_compile_selector(sel)] if sel else []) + _NOVELIA_SELECTORS
     fragment = None
-    for s in selectors:
-        if not s:
-            continue
-        node = soup.select_one(s)
+    for compiled in selectors:
+        node = compiled.select_one(soup)
         if node and node.get_text(strip=True):
-            fragment = str(node)
+            fragment = node
             break
 
-    if not fragment:
+    if fragment is None:
         # 回退到默认提取
-        title, fragment = _extract_main_html(html)
+        title, fragment = _extract_main_soup(soup)
 
     _html_to_epub(title, fragment, output_epub)
     return output_epub
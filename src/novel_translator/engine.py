@@ -12,18 +12,26 @@ novel_translator.engine - 翻译引擎核心模块
 - 质量扫描与选择性重翻
 """
 
+import copy
 import os
 import re
+import sys
 import time
+import html
 import json
+import queue
+import random
+import sqlite3
 import hashlib
 import threading
+import traceback
 import warnings
+import unicodedata
 
 import ebooklib
 import ebooklib.utils as _ebooklib_utils
 from ebooklib import epub
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, XMLParsedAsHTMLWarning
 
 # ── Monkey-patch ──────────────────────────────────────────────
 # 修复 ebooklib 在 write_epub 时因 EpubNav 内容为空导致 lxml 解析崩溃
@@ -32,6 +40,11 @@ _original_get_pages = _ebooklib_utils.get_pages
 
 def _safe_get_pages(item):
     try:
+        # get_pages 只收集带 epub:type 属性的元素；原文中没有该字样时无需解析和序列化正文
+        content = item.content
+        marker = b"epub:type" if isinstance(content, bytes) else "epub:type"
+        if not content or marker not in content:
+            return []
         body = item.get_body_content()
         if not body or not body.strip():
             return []
@@ -49,12 +62,59 @@ from typing import Callable, Optional
 
 from novel_translator.providers import create_provider, AIProvider
 
+# 可选: orjson 加速断点序列化（大段中日文字符串快数倍），缺失时回退标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_dumpb(obj, indent: bool = False) -> bytes:
+    """序列化为 UTF-8 字节（不转义非 ASCII 字符）"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loadb(data: bytes):
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+# 可选: zstandard 压缩断点快照（中日文译文约可压缩至 1/3），读取时按魔数识别，兼容未压缩的旧文件
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# 可选: pyahocorasick 单遍匹配全部质量扫描关键词，缺失时逐个关键词 str.count
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+# 章节 HTML 解析器：优先 lxml（C 实现，建树快数倍），缺失时回退纯 Python 的 html.parser。
+# 读取章节与写出 EPUB 必须使用同一解析器，保证分段结构一致。
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = "lxml"
+except ImportError:
+    _BS4_PARSER = "html.parser"
+# EPUB 章节是 XHTML，按 HTML 解析是有意为之（分段逻辑依赖 HTML 树），忽略 bs4 的提示。
+# 只过滤归属于本模块的告警，不影响宿主进程中其他代码的 bs4 用法
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning, module=r"novel_translator\.engine")
+
 
 # =====================================================================
 # 数据类
 # =====================================================================
 
-@dataclass
+@dataclass(slots=True)
 class TranslationConfig:
     """翻译任务配置"""
 
@@ -76,6 +136,8 @@ class TranslationConfig:
     chunk_size: int = 1500      # 0 = 整章翻译
     concurrent_workers: int = 1
     retry_count: int = 3
+    chapter_workers: int = 1    # 同时翻译的章节数 (1=逐章顺序翻译)
+    batch_chapters: int = 1     # 连续短章节合并为一次请求的最大章数 (1=关闭)
 
     # 文件
     input_file: str = ""
@@ -92,6 +154,8 @@ class TranslationConfig:
 
     # 断点续传
     enable_checkpoint: bool = True
+    # 跨运行的持久化 LLM 响应缓存（按完整请求参数命中，见 LLMCache）
+    enable_llm_cache: bool = False
 
     # 上下文注入
     context_lines: int = 5     # 前文上下文行数 (0=关闭)
@@ -109,8 +173,15 @@ class TranslationConfig:
     # 是否开启翻译过程的流式日志输出（逐块/逐 token 回调）
     stream_logs: bool = False
 
+    def __post_init__(self):
+        # 低基数字符串驻留：日志 / 缓存键中反复比较时只需比较指针
+        self.provider = sys.intern(self.provider)
+        self.model_name = sys.intern(self.model_name)
+        self.model_type = sys.intern(self.model_type)
+        self.output_format = sys.intern(self.output_format)
+
 
-@dataclass
+@dataclass(slots=True)
 class TranslationProgress:
     """运行时翻译进度"""
 
@@ -123,7 +194,7 @@ class TranslationProgress:
     is_paused: bool = False
     is_cancelled: bool = False
     translated_chars: int = 0
-    start_time: float = 0
+    start_time: float = 0  # time.monotonic() 时刻
     elapsed_time: float = 0
 
 
@@ -132,61 +203,500 @@ class TranslationProgress:
 # =====================================================================
 
 class ChapterInfo:
-    """EPUB 章节元数据"""
+    """EPUB 章节元数据
+
+    原始 HTML 不再单独复制一份，需要时从 `item` 懒解码；
+    `char_count` 由纯文本长度即时计算。`content` 可能与引擎的章节缓存共用，
+    只读不改。
+    """
+
+    __slots__ = ("index", "name", "content", "item", "_html_content")
 
     def __init__(self, index: int, name: str, content: str, item=None, html_content: str = ""):
         self.index = index
-        self.name = name
+        # 与断点中驻留的章节名比较时走指针相等快路径
+        self.name = sys.intern(name) if isinstance(name, str) else name
         self.content = content        # 纯文本（用于分块和翻译）
-        self.html_content = html_content  # 原始 HTML（用于结构保留输出）
-        self.char_count = len(content)
         self.item = item
+        self._html_content = html_content or None
+
+    @property
+    def html_content(self) -> str:
+        """原始 HTML（用于结构保留输出）"""
+        if self._html_content is not None:
+            return self._html_content
+        if self.item is None:
+            return ""
+        raw = self.item.get_content()
+        return raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else str(raw)
+
+    @property
+    def char_count(self) -> int:
+        return len(self.content)
+
+    def release_content(self):
+        """译文已写入断点后丢弃对原文的引用。
+
+        翻译运行开始时引擎已清空章节缓存，此时原文随之释放，降低长篇小说的常驻内存。
+        """
+        self.content = ""
+
+
+@dataclass(slots=True)
+class Segment:
+    """章节 body 下一个子元素的结构信息（parse_html_structured 的输出单元）
+
+    整本书的分段会驻留到写出 EPUB 为止，用 slots 对象代替字典以减少内存占用。
+    """
+
+    type: str             # "text" | "image" | "heading" | "skip"
+    tag: str              # 原始标签名（裸文本节点为空）
+    text: str             # 提取的纯文本
+    html: str             # 原始 HTML 片段
+    attrs: dict           # 标签属性字典
+    translate: bool       # 是否参与翻译
+    contains_media: bool  # 是否包含图片等媒体
 
 
 class CheckpointManager:
-    """断点续传管理器 — 基于 JSON 文件"""
+    """断点续传管理器 — JSON 快照 + 追加式 JSONL 日志
+
+    - `<output>.checkpoint.json`：压缩后的完整快照（供 GUI / 修复工具读取）
+    - `<output>.checkpoint.jsonl`：每完成一章 / 缓存一个分块即追加一行，
+      避免每章重写整个快照导致 O(N²) 写入；`load()` 与 `compact()` 时合并回快照。
+
+    除已完成章节外，还按分块原文哈希缓存译文（translations），
+    相同原文在后续运行或其他章节中可直接复用，免去 API 调用。
+
+    日志行由后台写线程批量落盘（约每 WRITE_INTERVAL 秒一次），翻译线程只做入队；
+    `flush()` / `compact()` 会先等待写线程写完。进程被强杀时最多丢失最后一个
+    时间窗内的记录，对应章节 / 分块下次会重新翻译。
+    """
+
+    WRITE_INTERVAL = 0.5
+    # sync() 时日志超过快照大小的该倍数才合并回快照
+    COMPACT_RATIO = 2
+    _STOP = object()
 
     def __init__(self, input_file: str, output_file: str):
-        h = hashlib.md5(input_file.encode()).hexdigest()[:8]
+        h = hashlib.blake2b(input_file.encode(), digest_size=4).hexdigest()
         base = os.path.splitext(output_file)[0]
-        self.checkpoint_file = f"{base}.checkpoint.json"
-        self.data: dict = {"completed_chapters": {}, "config_hash": h}
+        self._init_state(f"{base}.checkpoint.json")
+        self.data["config_hash"] = h
+
+    @classmethod
+    def from_checkpoint_file(cls, checkpoint_file: str) -> "CheckpointManager":
+        """直接以已有断点文件路径构造（用于恢复 / 重翻）"""
+        cp = cls.__new__(cls)
+        cp._init_state(checkpoint_file)
+        return cp
+
+    def _init_state(self, checkpoint_file: str):
+        self.checkpoint_file = checkpoint_file
+        self.journal_file = self.journal_path(checkpoint_file)
+        self.data = {"completed_chapters": {}, "translations": {}}
+        # 可重入：load() 持锁期间会调用 compact()；并发 worker 写入时保护 data 与日志文件
+        self._lock = threading.RLock()
+        self._journal_fp = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        # 内存数据是否有尚未写入快照的变更
+        self._dirty = True
+
+    @property
+    def data(self) -> dict:
+        return self._data
+
+    @data.setter
+    def data(self, value: dict):
+        # 缓存内层字典引用，查询时免去每次 .get("completed_chapters", {}) 的查找与空字典分配
+        self._data = value
+        self._completed = value.setdefault("completed_chapters", {})
+        self._translations = value.setdefault("translations", {})
+
+    @staticmethod
+    def journal_path(checkpoint_file: str) -> str:
+        return checkpoint_file + "l"
+
+    @classmethod
+    def read_file(cls, checkpoint_file: str) -> dict:
+        """读取快照并重放追加日志（后写覆盖先写），返回合并后的数据。
+
+        快照损坏时抛出异常；日志末尾因中断产生的残缺行会被忽略。
+        """
+        return cls.replay_journal(checkpoint_file, cls.read_snapshot(checkpoint_file))
+
+    @staticmethod
+    def read_snapshot(checkpoint_file: str) -> dict:
+        """只读取快照（不含日志）；文件不存在时返回空字典，损坏时抛出异常"""
+        if not os.path.exists(checkpoint_file):
+            return {}
+        with open(checkpoint_file, "rb") as f:
+            raw = f.read()
+        if raw[:4] == _ZSTD_MAGIC:
+            if _zstd is None:
+                raise ImportError("该断点文件为 zstd 压缩格式，需要安装 zstandard：pip install zstandard")
+            raw = _zstd.ZstdDecompressor().decompressobj().decompress(raw)
+        return _json_loadb(raw)
+
+    @classmethod
+    def replay_journal(cls, checkpoint_file: str, data: dict) -> dict:
+        """在快照数据 data 上重放追加日志并返回（原地修改）"""
+        completed = {sys.intern(k): v for k, v in data.get("completed_chapters", {}).items()}
+        data["completed_chapters"] = completed
+        translations = data.setdefault("translations", {})
+        journal = cls.journal_path(checkpoint_file)
+        if os.path.exists(journal):
+            with open(journal, "rb") as f:
+                for line in f:
+                    try:
+                        rec = _json_loadb(line)
+                    except ValueError:
+                        continue
+                    if "chapter" in rec:
+                        completed[sys.intern(rec["chapter"])] = rec.get("text", "")
+                    elif "translation" in rec:
+                        translations[rec["translation"]] = rec.get("text", "")
+        return data
 
     def load(self):
-        if os.path.exists(self.checkpoint_file):
-            try:
-                with open(self.checkpoint_file, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-            except Exception:
-                self.data = {"completed_chapters": {}}
-        return self.data
+        with self._lock:
+            return self._load_locked()
 
-    def save(self):
+    def _load_locked(self):
+        config_hash = self.data.get("config_hash")
+        # 快照缺失或存在未合并的日志时才需要重写快照
+        self._dirty = os.path.exists(self.journal_file) or not os.path.exists(self.checkpoint_file)
         try:
-            with open(self.checkpoint_file, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            snapshot = self.read_snapshot(self.checkpoint_file)
+        except ImportError:
+            # 缺少解压依赖时不能当作空断点处理，否则压缩后会覆盖原文件
+            raise
         except Exception:
-            pass
+            # 快照损坏：另存一份供排查，日志仍在空数据上重放，已追加的章节不会丢失
+            try:
+                os.replace(self.checkpoint_file, self.checkpoint_file + ".bak")
+            except OSError:
+                pass
+            snapshot = {}
+            self._dirty = True
+        # 日志读取出错时直接抛出，不能继续 compact() 删除尚未合并的日志
+        self.data = self.replay_journal(self.checkpoint_file, snapshot)
+        if config_hash and "config_hash" not in self.data:
+            self.data["config_hash"] = config_hash
+            self._dirty = True
+        # 合并日志到快照，之后的追加从空日志开始
+        self.compact()
+        return self.data
+
+    def _append(self, record: dict):
+        """调用方需持有 self._lock；仅入队，由后台线程写入日志"""
+        self._queue.put(_json_dumpb(record) + b"\n")
+        self._dirty = True
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = False
+            while True:
+                if item is self._STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    if self._journal_fp is None:
+                        self._journal_fp = open(self.journal_file, "ab")
+                    self._journal_fp.write(b"".join(batch))
+                    self._journal_fp.flush()
+                except Exception:
+                    pass
+            if stop:
+                return
+            time.sleep(self.WRITE_INTERVAL)
+
+    def _stop_writer(self):
+        """调用方需持有 self._lock：写完队列中剩余记录后结束写线程"""
+        if self._writer is not None:
+            self._queue.put(self._STOP)
+            self._writer.join()
+            self._writer = None
+        self._close_journal()
+
+    def compact(self):
+        """将内存中的完整数据写回快照，并清空追加日志。
+
+        自上次写快照以来没有新记录时直接返回：续跑一本已基本译完的长篇时，
+        加载与结束阶段都无需重写整份快照。
+        """
+        with self._lock:
+            self._stop_writer()
+            if not self._dirty:
+                return
+            try:
+                self.write_snapshot(self.checkpoint_file, self.data)
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+                self._dirty = False
+            except Exception:
+                pass
+
+    @staticmethod
+    def write_snapshot(checkpoint_file: str, data: dict):
+        """先写临时文件再 os.replace 原子替换，写入中途崩溃不会损坏已有快照。
+
+        默认写紧凑 JSON（有 zstandard 时再压缩）；设置环境变量 NOVEL_CKPT_DEBUG
+        时写未压缩、缩进的 JSON，便于人工查看。
+        """
+        if os.environ.get("NOVEL_CKPT_DEBUG"):
+            payload = _json_dumpb(data, indent=True)
+        elif _zstd is not None:
+            payload = _zstd.ZstdCompressor(level=3).compress(_json_dumpb(data))
+        else:
+            payload = _json_dumpb(data)
+        tmp = checkpoint_file + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, checkpoint_file)
+
+    def sync(self):
+        """写完日志但通常不重写快照，写入量与改动量成正比（用于选择性重翻等少量改动）。
+
+        快照不存在，或日志已增长到快照的 COMPACT_RATIO 倍以上时才合并。
+        """
+        with self._lock:
+            self._stop_writer()
+            journal_size = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+            snapshot_size = os.path.getsize(self.checkpoint_file) if os.path.exists(self.checkpoint_file) else 0
+            if not snapshot_size or journal_size > snapshot_size * self.COMPACT_RATIO:
+                self.compact()
+
+    # 兼容旧接口：save() 即整体写回快照
+    save = compact
+
+    def flush(self):
+        """结束一轮翻译时调用：合并日志并释放文件句柄"""
+        self.compact()
+
+    def _close_journal(self):
+        if self._journal_fp is not None:
+            try:
+                self._journal_fp.close()
+            except Exception:
+                pass
+            self._journal_fp = None
 
     def is_chapter_done(self, chapter_name: str) -> bool:
-        return chapter_name in self.data.get("completed_chapters", {})
+        return chapter_name in self._completed
 
     def get_chapter_result(self, chapter_name: str) -> str:
-        return self.data.get("completed_chapters", {}).get(chapter_name, "")
+        return self._completed.get(chapter_name, "")
+
+    def lookup_chapter(self, chapter_name: str) -> str | None:
+        """已完成则返回译文，否则返回 None（续传扫描时一次查找代替两次）"""
+        return self._completed.get(chapter_name)
 
     def mark_chapter_done(self, chapter_name: str, translated_text: str):
-        if "completed_chapters" not in self.data:
-            self.data["completed_chapters"] = {}
-        self.data["completed_chapters"][chapter_name] = translated_text
-        self.save()
+        with self._lock:
+            self._completed[chapter_name] = translated_text
+            self._append({"chapter": chapter_name, "text": translated_text})
 
     def get_completed_count(self) -> int:
-        return len(self.data.get("completed_chapters", {}))
+        return len(self._completed)
+
+    # ── 分块译文缓存 ──
+
+    _SPACE_RUN_RE = re.compile(r"[ \t\u3000]+")
+    # 全角 ASCII（U+FF01–FF5E）与半角片假名/标点（U+FF61–FF9F）；这两段的 NFKC 只做宽度映射，
+    # 按连续片段整体处理，半角浊点（ｶﾞ）会合成为全角（ガ）
+    _WIDTH_FORMS_RE = re.compile(r"[\uFF01-\uFF5E\uFF61-\uFF9F]+")
+
+    @classmethod
+    def normalize_source(cls, source: str) -> str:
+        """缓存键用的原文归一化：只统一全/半角宽度，并压缩行内连续空白（含全角空格），保留换行结构。
+
+        不做完整 NFKC：①/1、½/1⁄2、㈱/(株) 等兼容字符在原文中含义不同，不能共享译文。
+        """
+        if not source.isascii():
+            source = cls._WIDTH_FORMS_RE.sub(lambda m: unicodedata.normalize("NFKC", m.group()), source)
+        return cls._SPACE_RUN_RE.sub(" ", source)
+
+    @classmethod
+    def translation_key(cls, source: str, model: str, lang: str = "zh") -> str:
+        """分块缓存键：blake2b(model|lang + 归一化原文)，非加密用途"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{model}|{lang}\0".encode("utf-8"))
+        h.update(cls.normalize_source(source).encode("utf-8"))
+        return h.hexdigest()
+
+    def get_translation(self, source: str, model: str, lang: str = "zh") -> str | None:
+        return self._translations.get(self.translation_key(source, model, lang))
+
+    def put_translation(self, source: str, model: str, lang: str, translated: str):
+        key = self.translation_key(source, model, lang)
+        with self._lock:
+            self._translations[key] = translated
+            self._append({"translation": key, "text": translated})
 
     def clear(self):
-        self.data = {"completed_chapters": {}}
-        if os.path.exists(self.checkpoint_file):
-            os.remove(self.checkpoint_file)
+        with self._lock:
+            self._stop_writer()
+            self.data = {"completed_chapters": {}, "translations": {}}
+            self._dirty = True
+            for path in (self.checkpoint_file, self.journal_file):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class LLMCache:
+    """持久化 LLM 响应缓存（SQLite，跨书籍 / 跨运行共享）
+
+    键为 (provider, 模型, 生成参数, system prompt, 用户内容, assistant 前缀) 的 blake2b 摘要，
+    与断点中按原文命中的分块缓存互补：相同请求重复运行（调试、重翻前对比等）时直接返回。
+    打开时清理过期条目，超过 MAX_ENTRIES 时按写入时间淘汰最旧的条目。
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "novel_translator", "llm_cache.sqlite3")
+    TTL = 30 * 24 * 3600  # 秒
+    MAX_ENTRIES = 200_000
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+        self._prune()
+
+    def _prune(self):
+        """删除过期条目，并把条目数限制在 MAX_ENTRIES 以内（先删最旧的）"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.TTL,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.MAX_ENTRIES,),
+            )
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+        # 非加密用途，与分块缓存键一致使用 blake2b
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and time.time() - row[1] < self.TTL:
+            return row[0]
+        return None
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """并发线程共享的限速闸门
+
+    任一线程收到 429 后调用 `penalize()` 设定统一的恢复时间点，
+    所有线程在下一次请求前经 `wait()` 一同暂停，避免各自重试继续消耗配额。
+    """
+
+    BASE_DELAY = 1.0
+    MAX_DELAY = 60.0
+    # 闸门打开后各线程随机错开的最长时间，避免同时醒来再次触发 429
+    RESUME_JITTER = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self, should_stop: Optional[Callable[[], bool]] = None):
+        waited = False
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.monotonic()
+            if should_stop and should_stop():
+                return
+            if remaining <= 0:
+                if waited:
+                    time.sleep(random.uniform(0, self.RESUME_JITTER))
+                return
+            waited = True
+            time.sleep(min(remaining, 0.5))
+
+    def penalize(self, seconds: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    @classmethod
+    def next_backoff(cls, prev: float) -> float:
+        """Decorrelated jitter：在 [BASE, prev*3] 内随机取值，上限 MAX_DELAY"""
+        return min(cls.MAX_DELAY, random.uniform(cls.BASE_DELAY, max(cls.BASE_DELAY, prev) * 3))
+
+
+# 最近一次 load_glossary() 读取的术语表：(文件键, 术语表)。文件未变化时跳过读取与 JSON 解析
+_glossary_cache: Optional[tuple] = None
+
+
+# 默认 system prompt（未配置 custom_prompt 时使用）
+_DEFAULT_SYSTEM_PROMPT = (
+    "你是一位精通中日文化的专业轻小说翻译专家。"
+    "请将用户输入的日文异世界转生小说片段翻译成流畅、地道的中文。\n\n"
+    "核心翻译原则：\n"
+    "1. 严格忠实原文：准确传达原文含义，不增加、不删减、不改写任何内容。原文没有的语气、情绪、语气词绝对不能添加。\n"
+    "2. 禁止添加语气词：不得自行添加原文中不存在的\u201c呀\u201d\u201c呢\u201d\u201c嘛\u201d\u201c哦\u201d\u201c啦\u201d\u201c哟\u201d\u201c呃\u201d等语气词。"
+    "只有原文明确包含对应的日文语气词（如「ね」「よ」「さ」「ぞ」「な」等）时，才可以翻译为相应的中文语气词。\n"
+    "3. 克制\u201c吧\u201d的使用：\u201c吧\u201d只在原文明确表达推测、建议、请求语气时使用，陈述句中不得滥用。\n"
+    "4. 本土化表达：使用简洁、符合中文书面语习惯的自然语句，避免日式直译和机翻腔调。\n"
+    "5. 异世界氛围：完整保留专有名词、魔法体系、等级制度等世界观元素。\n"
+    "6. 角色语气：保留原文角色的说话风格，但不要过度演绎或夸张化。\n"
+    "7. 段落与断句：对话使用「」或\u201c\u201d。原文中语意连贯的相邻短句应合并为流畅的长句，不要逐句机械断行；"
+    "仅在话题转换、场景切换或原文明确分段处另起新段。\n"
+    "8. 术语统一：严格遵守术语表中的译名。\n"
+    "9. 语体适配：第一人称内心独白和日常对话使用现代口语体，禁用文言或过度书面化措辞"
+    "（如\u201c何以见得\u201d\u201c有何贵干\u201d\u201c愿闻其详\u201d等）。仅在原文使用正式/古风语体的角色台词中方可使用对应文体。\n"
+    "10. 时态准确：阐述世界观设定和一般性规则时使用一般时态，不要误用完成时态\u201c了\u201d。叙述已发生事件时正常使用。\n"
+    "11. 禁止添词：不得添加原文中没有的名词、量词或修饰语。日文拟态词（如ヌラヌラ、ネットリ等）"
+    "应译为对应感觉的中文表达，不可擅自补充具体名词。\n"
+    "12. 纯净输出：只输出翻译正文，严禁输出任何翻译注释、译者注、脚注、说明文字、括号补充解释。"
+    "不得添加\u201c注：\u201d、\u201c译注：\u201d、\u201c*\u201d注释、任何meta内容。\n"
+    "13. 术语前后一致：同一专有名词在全文中必须使用完全相同的译名和标记格式。"
+    "例如：『金剛』始终译为「金刚」、生涯の魔法始终译为\u201c终生魔法\u201d、ウルタス始终译为\u201c厄尔塔斯\u201d、"
+    "マナ始终译为\u201c魔力素\u201d或术语表指定译名。禁止在不同段落中对同一术语使用不同译法。\n"
+    "14. 标记统一：专有名词一律使用「」标记（如「金刚」「魅惑之瞳」），"
+    "不得混用『』、《》、【】、\u201c\u201d等不同标记符号。\n"
+    "15. 称呼翻译：日文\u201c先輩\u201d在学园背景下，必须根据性别翻译——"
+    "女性先輩一律译为\u201c学姐\u201d，男性先輩一律译为\u201c学长\u201d。"
+    "严禁使用\u201c前辈\u201d这一性别模糊的译法。同一角色的称呼在全文中必须保持完全一致，不得在不同段落间切换用词。\n"
+    "16. 人名一致性：同一角色在全文中必须使用完全相同的中文译名，严禁出现变体。"
+    "例如：ミヤ始终译为\u201c弥娅\u201d（不可出现\u201c米娅\u201d\u201c米亚\u201d\u201c宫\u201d等变体）；"
+    "クリス始终译为\u201c克里斯\u201d（不可出现\u201c克莉丝\u201d等变体）；"
+    "グリージャー的中文名始终为\u201c安涅莉丝\u201d（不可出现\u201c格里杰尔\u201c格里杰\u201d等音译变体）。"
+    "当原文出现全名时（如アネスト・グリージャー），译为\u201c安涅莉丝·格里杰尔\u201d。\n\n"
+    "翻译预设：简洁准确，紧贴原文，语意连贯的短句合并为流畅长句，不添加原文没有的修辞和语气。\n"
+)
 
 
 # =====================================================================
@@ -200,12 +710,15 @@ class TranslatorEngine:
         self.config = config
         self.progress = TranslationProgress()
         self.provider: Optional[AIProvider] = None
+        # 创建 self.provider 所用的全部参数；不变时 _init_provider() 直接复用
+        self._provider_key: Optional[tuple] = None
         self.glossary: dict = {}
         self.system_prompt: str = ""
         self._lock = threading.Lock()
         self._pause_event = threading.Event()
         self._pause_event.set()
         self.checkpoint: Optional[CheckpointManager] = None
+        self._rate_limiter = RateLimiter()
 
         # 回调接口
         self.on_progress: Optional[Callable] = None
@@ -217,47 +730,82 @@ class TranslatorEngine:
         self.on_stream: Optional[Callable] = None
         # 暂停后下次启动时是否重新加载外部配置
         self._pending_reload_on_start: bool = False
+        # 选择性重翻时需要新的译文，跳过分块译文缓存
+        self._bypass_translation_cache: bool = False
+        # _get_assistant_prefix() 的术语表渲染缓存
+        self._glossary_block: str = ""
+        self._glossary_block_src: Optional[dict] = None
+        # build_completion_prompt() 的术语表段落缓存（同样按术语表对象失效）
+        self._completion_glossary: str = ""
+        self._completion_glossary_src: Optional[dict] = None
+        # build_system_prompt() 的结果缓存：((基础提示词, 术语表条目), 完整提示词)
+        self._system_prompt_cache: Optional[tuple] = None
+        # 持久化 LLM 响应缓存（config.enable_llm_cache 时在首次使用时打开）
+        self._llm_cache: Optional[LLMCache] = None
+        # 已解析的源 EPUB：((路径, mtime, 大小), EpubBook)
+        self._source_book: Optional[tuple] = None
+        # get_chapters() 的解析结果：(文件键, [(序号, 名称, 纯文本, item, 分段)])
+        self._chapters_cache: Optional[tuple] = None
+        # get_chapters() 解析出的章节分段（按 item 名），写出 EPUB 时取用，避免重复解析正文
+        self._chapter_segments: dict[str, list[Segment]] = {}
+        # 并发翻译线程池：整次运行复用，避免每个批次重建线程
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers: int = 0
+        # 上次触发 on_progress 的时刻（time.monotonic），用于限频
+        self._last_progress_emit: float = 0.0
 
     # ── 术语表/回显清理辅助 ──
 
-    @staticmethod
-    def _is_glossary_line(line: str) -> bool:
-        return bool(re.match(r'^\s*[-•]?\s*.+\s*(?:->|→|＝|=)\s*.+$', line))
+    _GLOSSARY_LINE_RE = re.compile(r'^\s*[-•]?\s*.+\s*(?:->|→|＝|=)\s*.+$')
 
-    @staticmethod
-    def _is_prompt_header_line(line: str) -> bool:
-        return bool(re.match(
-            r'^[\s\[【]*'
-            r'(?:待翻译(?:原文|文本|内容)?|原文|源文|译文(?:本)?|翻译(?:文本|结果|内容)?)'
-            r'[\s\]】]*[:：]?\s*$',
-            line
-        ))
+    @classmethod
+    def _is_glossary_line(cls, line: str) -> bool:
+        return cls._GLOSSARY_LINE_RE.match(line) is not None
 
-    @staticmethod
-    def _is_non_story_meta_line(line: str) -> bool:
+    _PROMPT_HEADER_RE = re.compile(
+        r'^[\s\[【]*'
+        r'(?:待翻译(?:原文|文本|内容)?|原文|源文|译文(?:本)?|翻译(?:文本|结果|内容)?)'
+        r'[\s\]】]*[:：]?\s*$'
+    )
+
+    @classmethod
+    def _is_prompt_header_line(cls, line: str) -> bool:
+        return cls._PROMPT_HEADER_RE.match(line) is not None
+
+    _META_KEYWORDS = (
+        "评价", "感想", "错别字", "反馈", "收藏", "点赞", "打赏", "评论",
+        "レビュー", "感想", "誤字", "評価", "ブックマーク", "ポイント", "いいね",
+    )
+    # 一次扫描判断是否含任一关键词；绝大多数正文行不含，省去逐个关键词的子串查找
+    _META_KEYWORD_RE = re.compile("|".join(map(re.escape, dict.fromkeys(_META_KEYWORDS))))
+
+    @classmethod
+    def _is_non_story_meta_line(cls, line: str) -> bool:
         text = (line or "").strip()
         if not text:
             return False
         lower = text.lower()
-        meta_keywords = (
-            "评价", "感想", "错别字", "反馈", "收藏", "点赞", "打赏", "评论",
-            "レビュー", "感想", "誤字", "評価", "ブックマーク", "ポイント", "いいね",
-        )
-        hit_count = sum(1 for kw in meta_keywords if kw in text)
-        if hit_count >= 2:
-            return True
+        if cls._META_KEYWORD_RE.search(text):
+            hit_count = sum(1 for kw in cls._META_KEYWORDS if kw in text)
+            if hit_count >= 2:
+                return True
         if lower.startswith("如果您能给予评价") or lower.startswith("よろしければ評価"):
             return True
         if "http://" in lower or "https://" in lower:
             return True
         return False
 
+    _PROMPT_ECHO_RE = re.compile(r'(强制术语表|术语表|待翻译|原文|译文|翻译文本|翻译结果)')
+    # 字符统计交给正则引擎 / map 在 C 层完成，避免逐字符的 Python 循环
+    _KANA_RE = re.compile('[\u3040-\u30ff]')
+    _CJK_KANA_RE = re.compile('[\u3040-\u30ff\u4e00-\u9fff]')
+
     def _looks_like_prompt_echo(self, text: str, original_text: str) -> bool:
         if not text or not text.strip():
             return True
 
         # 明显提示词/术语表回显
-        if re.search(r'(强制术语表|术语表|待翻译|原文|译文|翻译文本|翻译结果)', text):
+        if self._PROMPT_ECHO_RE.search(text):
             return True
 
         # 术语表样式行过多
@@ -277,8 +825,8 @@ class TranslatorEngine:
                     return True
 
         # 日文假名占比过高，疑似原文回显
-        kana = sum(1 for ch in text if '\u3040' <= ch <= '\u30ff')
-        alpha = sum(1 for ch in text if ch.isalpha())
+        kana = len(self._KANA_RE.findall(text))
+        alpha = sum(map(str.isalpha, text))
         if alpha > 0 and (kana / alpha) > 0.10:
             return True
 
@@ -288,18 +836,11 @@ class TranslatorEngine:
         """检测到回显时的回退策略：临时关闭 prefix 续写并重试一次。"""
         if not self.provider:
             return ""
-        # 尝试关闭 prefix 续写
-        if hasattr(self.provider, "use_prefix_completion"):
-            orig = getattr(self.provider, "use_prefix_completion", False)
-            try:
-                if orig:
-                    setattr(self.provider, "use_prefix_completion", False)
-                    return self.provider.translate(self.system_prompt, user_content, assistant_prefix="")
-            finally:
-                try:
-                    setattr(self.provider, "use_prefix_completion", orig)
-                except Exception:
-                    pass
+        # 尝试关闭 prefix 续写：Provider 实例由并发线程共用，改用浅拷贝而非临时改写原实例
+        if getattr(self.provider, "use_prefix_completion", False):
+            provider = copy.copy(self.provider)
+            provider.use_prefix_completion = False
+            return provider.translate(self.system_prompt, user_content, assistant_prefix="")
         # 普通重试（不带 assistant_prefix）
         try:
             return self.provider.translate(self.system_prompt, user_content, assistant_prefix="")
@@ -310,7 +851,12 @@ class TranslatorEngine:
         # DeepSeek Beta 前缀续写更容易回显，术语表已并入 system_prompt，避免重复注入
         if self.config.deepseek_beta and self.config.use_prefix_completion:
             return ""
-        return self.build_assistant_glossary()
+        # 每个分块（及每次重试）都会用到，按术语表对象缓存渲染结果；
+        # 术语表只会被 load_glossary() 整体替换，不会原地修改
+        if self._glossary_block_src is not self.glossary:
+            self._glossary_block = self.build_assistant_glossary()
+            self._glossary_block_src = self.glossary
+        return self._glossary_block
 
     # ── 日志 ──
 
@@ -335,7 +881,7 @@ class TranslatorEngine:
         provider_type = self.config.provider or "openai"
         if not self.config.api_key and provider_type != "ollama":
             raise ValueError("请填写 API Key")
-        self.provider = create_provider(
+        kwargs = dict(
             provider_type=provider_type,
             api_key=self.config.api_key,
             base_url=self.config.base_url,
@@ -351,6 +897,11 @@ class TranslatorEngine:
             use_prefix_completion=self.config.use_prefix_completion,
             use_fim_completion=self.config.use_fim_completion,
         )
+        key = tuple(kwargs.values())
+        # 同一引擎内重复开始 / 续传 / 重翻时，配置未变则沿用已初始化的 Provider（及其客户端）
+        if self.provider is None or key != self._provider_key:
+            self.provider = create_provider(**kwargs)
+            self._provider_key = key
         if self.config.deepseek_beta:
             mode = "FIM补全" if self.config.use_fim_completion else ("前缀续写" if self.config.use_prefix_completion else "Beta模式")
             self.log(f"✅ {self.provider.provider_name} 已初始化 ({self.config.model_name}) [DeepSeek Beta · {mode}]")
@@ -360,13 +911,20 @@ class TranslatorEngine:
     # ── 术语表 ──
 
     def load_glossary(self, filepath: str = "") -> dict:
+        global _glossary_cache
         path = filepath or self.config.glossary_file
         if not path or not os.path.exists(path):
             self.log("ℹ️ 未加载术语表")
             return {}
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                glossary = json.load(f)
+            key = self._file_key(path)
+            cached = _glossary_cache
+            if cached and cached[0] == key:
+                glossary = dict(cached[1])
+            else:
+                with open(path, "rb") as f:
+                    glossary = _json_loadb(f.read())
+                _glossary_cache = (key, dict(glossary))
             self.log(f"✅ 术语表已加载: {len(glossary)} 条")
             return glossary
         except Exception as e:
@@ -375,59 +933,26 @@ class TranslatorEngine:
 
     def save_glossary(self, glossary: dict, filepath: str):
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(glossary, f, ensure_ascii=False, indent=2)
+            with open(filepath, "wb") as f:
+                f.write(_json_dumpb(glossary, indent=True))
         except Exception as e:
             self.log(f"⚠️ 术语表保存失败: {e}")
 
     # ── 提示词构建 ──
 
     def build_system_prompt(self, glossary_dict: dict | None = None) -> str:
-        if self.config.custom_prompt:
-            base_prompt = self.config.custom_prompt
-        else:
-            base_prompt = (
-                "你是一位精通中日文化的专业轻小说翻译专家。"
-                "请将用户输入的日文异世界转生小说片段翻译成流畅、地道的中文。\n\n"
-                "核心翻译原则：\n"
-                "1. 严格忠实原文：准确传达原文含义，不增加、不删减、不改写任何内容。原文没有的语气、情绪、语气词绝对不能添加。\n"
-                "2. 禁止添加语气词：不得自行添加原文中不存在的\u201c呀\u201d\u201c呢\u201d\u201c嘛\u201d\u201c哦\u201d\u201c啦\u201d\u201c哟\u201d\u201c呃\u201d等语气词。"
-                "只有原文明确包含对应的日文语气词（如「ね」「よ」「さ」「ぞ」「な」等）时，才可以翻译为相应的中文语气词。\n"
-                "3. 克制\u201c吧\u201d的使用：\u201c吧\u201d只在原文明确表达推测、建议、请求语气时使用，陈述句中不得滥用。\n"
-                "4. 本土化表达：使用简洁、符合中文书面语习惯的自然语句，避免日式直译和机翻腔调。\n"
-                "5. 异世界氛围：完整保留专有名词、魔法体系、等级制度等世界观元素。\n"
-                "6. 角色语气：保留原文角色的说话风格，但不要过度演绎或夸张化。\n"
-                "7. 段落与断句：对话使用「」或\u201c\u201d。原文中语意连贯的相邻短句应合并为流畅的长句，不要逐句机械断行；"
-                "仅在话题转换、场景切换或原文明确分段处另起新段。\n"
-                "8. 术语统一：严格遵守术语表中的译名。\n"
-                "9. 语体适配：第一人称内心独白和日常对话使用现代口语体，禁用文言或过度书面化措辞"
-                "（如\u201c何以见得\u201d\u201c有何贵干\u201d\u201c愿闻其详\u201d等）。仅在原文使用正式/古风语体的角色台词中方可使用对应文体。\n"
-                "10. 时态准确：阐述世界观设定和一般性规则时使用一般时态，不要误用完成时态\u201c了\u201d。叙述已发生事件时正常使用。\n"
-                "11. 禁止添词：不得添加原文中没有的名词、量词或修饰语。日文拟态词（如ヌラヌラ、ネットリ等）"
-                "应译为对应感觉的中文表达，不可擅自补充具体名词。\n"
-                "12. 纯净输出：只输出翻译正文，严禁输出任何翻译注释、译者注、脚注、说明文字、括号补充解释。"
-                "不得添加\u201c注：\u201d、\u201c译注：\u201d、\u201c*\u201d注释、任何meta内容。\n"
-                "13. 术语前后一致：同一专有名词在全文中必须使用完全相同的译名和标记格式。"
-                "例如：『金剛』始终译为「金刚」、生涯の魔法始终译为\u201c终生魔法\u201d、ウルタス始终译为\u201c厄尔塔斯\u201d、"
-                "マナ始终译为\u201c魔力素\u201d或术语表指定译名。禁止在不同段落中对同一术语使用不同译法。\n"
-                "14. 标记统一：专有名词一律使用「」标记（如「金刚」「魅惑之瞳」），"
-                "不得混用『』、《》、【】、\u201c\u201d等不同标记符号。\n"
-                "15. 称呼翻译：日文\u201c先輩\u201d在学园背景下，必须根据性别翻译——"
-                "女性先輩一律译为\u201c学姐\u201d，男性先輩一律译为\u201c学长\u201d。"
-                "严禁使用\u201c前辈\u201d这一性别模糊的译法。同一角色的称呼在全文中必须保持完全一致，不得在不同段落间切换用词。\n"
-                "16. 人名一致性：同一角色在全文中必须使用完全相同的中文译名，严禁出现变体。"
-                "例如：ミヤ始终译为\u201c弥娅\u201d（不可出现\u201c米娅\u201d\u201c米亚\u201d\u201c宫\u201d等变体）；"
-                "クリス始终译为\u201c克里斯\u201d（不可出现\u201c克莉丝\u201d等变体）；"
-                "グリージャー的中文名始终为\u201c安涅莉丝\u201d（不可出现\u201c格里杰尔\u201c格里杰\u201d等音译变体）。"
-                "当原文出现全名时（如アネスト・グリージャー），译为\u201c安涅莉丝·格里杰尔\u201d。\n\n"
-                "翻译预设：简洁准确，紧贴原文，语意连贯的短句合并为流畅长句，不添加原文没有的修辞和语气。\n"
-            )
+        base_prompt = self.config.custom_prompt or _DEFAULT_SYSTEM_PROMPT
         # 将术语表合并到 system prompt，确保各类模型/接口均能稳定获取术语约束。
         g = glossary_dict if glossary_dict is not None else self.glossary
+        # 提示词与术语表内容都未变时直接复用上次拼好的结果
+        key = (base_prompt, tuple(g.items()) if g else ())
+        if self._system_prompt_cache and self._system_prompt_cache[0] == key:
+            return self._system_prompt_cache[1]
         glossary_block = self.build_assistant_glossary(g)
         if glossary_block:
             base_prompt = base_prompt.rstrip()
             base_prompt = f"{base_prompt}\n\n{glossary_block.strip()}"
+        self._system_prompt_cache = (key, base_prompt)
         return base_prompt
 
     def build_assistant_glossary(self, glossary_dict: dict | None = None) -> str:
@@ -435,10 +960,7 @@ class TranslatorEngine:
         g = glossary_dict if glossary_dict is not None else self.glossary
         if not g:
             return ""
-        glossary_text = "【强制术语表】\n"
-        for k, v in g.items():
-            glossary_text += f"- {k} -> {v}\n"
-        return glossary_text
+        return "【强制术语表】\n" + "".join(f"- {k} -> {v}\n" for k, v in g.items())
 
     def build_completion_prompt(self, text: str, prev_context: str = "") -> str:
         """为补全模型构建完整 prompt（含 few-shot 示例 + 术语表 + 上下文 + 原文）"""
@@ -447,10 +969,13 @@ class TranslatorEngine:
 
         g = self.glossary
         if g:
-            parts.append("【术语表（必须严格遵守）】")
-            for k, v in g.items():
-                parts.append(f"- {k} → {v}")
-            parts.append("")
+            # 每个分块都要拼一次 prompt，术语表段落只在术语表替换后重新渲染
+            if self._completion_glossary_src is not g:
+                self._completion_glossary = "【术语表（必须严格遵守）】\n" + "".join(
+                    f"- {k} → {v}\n" for k, v in g.items()
+                )
+                self._completion_glossary_src = g
+            parts.append(self._completion_glossary)
 
         if self.config.few_shot_examples:
             parts.append(self.config.few_shot_examples)
@@ -471,109 +996,133 @@ class TranslatorEngine:
     # ── 文本处理 ──
 
     # 需保留的行内标签（翻译内部文本但保留标签结构）
-    _INLINE_TAGS = {'em', 'strong', 'b', 'i', 'u', 's', 'span', 'a', 'small', 'sub', 'sup', 'mark'}
+    _INLINE_TAGS = frozenset({'em', 'strong', 'b', 'i', 'u', 's', 'span', 'a', 'small', 'sub', 'sup', 'mark'})
     # Ruby 注音标签（保留原样不翻译）
-    _RUBY_TAGS = {'ruby', 'rt', 'rp', 'rb'}
+    _RUBY_TAGS = frozenset({'ruby', 'rt', 'rp', 'rb'})
     # 块级元素（每个产生一个翻译段落）
-    _BLOCK_TAGS = {'p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'li', 'dt', 'dd', 'figcaption'}
+    _BLOCK_TAGS = frozenset({'p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'li', 'dt', 'dd', 'figcaption'})
     # 不翻译的标签（保留原样）
-    _SKIP_TAGS = {'img', 'image', 'svg', 'br', 'hr', 'table', 'thead', 'tbody', 'tr', 'td', 'th', 'script', 'style'}
+    _SKIP_TAGS = frozenset({'img', 'image', 'svg', 'br', 'hr', 'table', 'thead', 'tbody', 'tr', 'td', 'th', 'script', 'style'})
+    # 插图类标签（_SKIP_TAGS 的子集）
+    _MEDIA_TAGS = frozenset({'img', 'image', 'svg'})
+    # 标签名 → 段落类型，结构解析时一次查表分派；未列出的标签见 _tag_kind()
+    _TAG_KIND = {
+        **{t: "skip" for t in _SKIP_TAGS},
+        **{t: "image" for t in _MEDIA_TAGS},
+        **{t: "heading" if t.startswith('h') else "text" for t in _BLOCK_TAGS},
+    }
+
+    @classmethod
+    def _tag_kind(cls, tag_name: str) -> str:
+        """未列入 _TAG_KIND 的标签：h 开头（header/hgroup 等）按标题处理，其余为容器"""
+        kind = cls._TAG_KIND.get(tag_name)
+        if kind is None:
+            kind = "heading" if tag_name.startswith('h') else "container"
+        return kind
+    # 结构解析只读取 <body>：跳过 <head> 中的样式 / 元数据建树。
+    # 仅用于 lxml（会为无 <body> 的片段补出隐式 body）；html.parser 下片段会被整体过滤掉
+    _BODY_STRAINER = SoupStrainer("body") if _BS4_PARSER == "lxml" else None
+    _HEAD_STRAINER = SoupStrainer("head")
+    _HEAD_RE = re.compile(r"<head\b[^>]*>.*?</head\s*>", re.IGNORECASE | re.DOTALL)
 
     @staticmethod
     def clean_html(html_content) -> str:
         """将 HTML 转换为纯文本（向后兼容）"""
         warnings.filterwarnings("ignore", category=UserWarning, module="bs4")
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = BeautifulSoup(html_content, _BS4_PARSER)
         return soup.get_text(separator="\n", strip=True)
 
     @staticmethod
-    def parse_html_structured(html_content) -> tuple[str, list[dict]]:
+    def parse_html_structured(html_content) -> tuple[str, list["Segment"]]:
         """结构感知的 HTML 解析。
 
         返回:
             (plain_text, segments)
             - plain_text: 用于分块和翻译的纯文本
-            - segments: 每个元素的结构信息列表，包含:
-              - type: "text" | "image" | "heading" | "skip"
-              - tag: 原始标签名
-              - text: 提取的纯文本
-              - html: 原始 HTML 片段
-              - attrs: 标签属性字典
+            - segments: 每个 body 子元素对应一个 Segment（字段见 Segment）
         """
         warnings.filterwarnings("ignore", category=UserWarning, module="bs4")
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = BeautifulSoup(html_content, _BS4_PARSER, parse_only=TranslatorEngine._BODY_STRAINER)
+        return TranslatorEngine._parse_soup_structured(soup)
+
+    @staticmethod
+    def _parse_soup_structured(soup) -> tuple[str, list["Segment"]]:
+        """parse_html_structured 的主体，接受已解析的 soup（只读，不修改文档树），
+        便于调用方复用同一次解析结果。"""
         body = soup.find("body")
         if not body:
             body = soup
 
         segments = []
         text_parts = []
-        media_tags = {'img', 'image', 'svg'}
+        media_tags = TranslatorEngine._MEDIA_TAGS
+        tag_kind = TranslatorEngine._TAG_KIND
 
         for element in body.children:
             if isinstance(element, str):
                 # 裸文本节点
                 stripped = element.strip()
                 if stripped:
-                    segments.append({
-                        "type": "text",
-                        "tag": "",
-                        "text": stripped,
-                        "html": stripped,
-                        "attrs": {},
-                        "translate": True,
-                        "contains_media": False,
-                    })
+                    segments.append(Segment(
+                        type="text",
+                        tag="",
+                        text=stripped,
+                        html=stripped,
+                        attrs={},
+                        translate=True,
+                        contains_media=False,
+                    ))
                     text_parts.append(stripped)
                 continue
 
-            tag_name = getattr(element, 'name', None)
+            # 非字符串节点均为 Tag，直接取 name
+            tag_name = element.name
             if not tag_name:
                 continue
 
-            if tag_name in TranslatorEngine._SKIP_TAGS:
+            kind = tag_kind.get(tag_name) or TranslatorEngine._tag_kind(tag_name)
+            if kind == "skip" or kind == "image":
                 # 图片、表格等不翻译，原样保留
-                seg_type = "image" if tag_name in media_tags else "skip"
-                segments.append({
-                    "type": seg_type,
-                    "tag": tag_name,
-                    "text": "",
-                    "html": str(element),
-                    "attrs": dict(element.attrs) if hasattr(element, 'attrs') else {},
-                    "translate": False,
-                    "contains_media": tag_name in media_tags,
-                })
+                segments.append(Segment(
+                    type=kind,
+                    tag=tag_name,
+                    text="",
+                    html=str(element),
+                    attrs=element.attrs,
+                    translate=False,
+                    contains_media=kind == "image",
+                ))
                 continue
 
-            if tag_name in TranslatorEngine._BLOCK_TAGS or tag_name.startswith('h'):
+            if kind != "container":
                 # 块级元素——提取文本用于翻译，保留内联标签结构
                 inner_text = element.get_text(strip=True)
                 contains_media = bool(element.find(media_tags))
                 if not inner_text:
                     # 空块级元素（可能含图片），保留原样
-                    segments.append({
-                        "type": "skip",
-                        "tag": tag_name,
-                        "text": "",
-                        "html": str(element),
-                        "attrs": {},
-                        "translate": False,
-                        "contains_media": contains_media,
-                    })
+                    segments.append(Segment(
+                        type="skip",
+                        tag=tag_name,
+                        text="",
+                        html=str(element),
+                        attrs={},
+                        translate=False,
+                        contains_media=contains_media,
+                    ))
                     continue
-                seg_type = "heading" if tag_name.startswith('h') else "text"
+                seg_type = kind
                 # heading 保持原样；正文段落可翻译（即使包含插图）
                 translatable_text = TranslatorEngine._extract_translatable_text_from_node(element)
                 can_translate = (seg_type == "text") and bool(translatable_text)
-                segments.append({
-                    "type": seg_type,
-                    "tag": tag_name,
-                    "text": translatable_text if can_translate else inner_text,
-                    "html": str(element),
-                    "attrs": dict(element.attrs) if hasattr(element, 'attrs') else {},
-                    "translate": can_translate,
-                    "contains_media": contains_media,
-                })
+                segments.append(Segment(
+                    type=seg_type,
+                    tag=tag_name,
+                    text=translatable_text if can_translate else inner_text,
+                    html=str(element),
+                    attrs=element.attrs,
+                    translate=can_translate,
+                    contains_media=contains_media,
+                ))
                 if can_translate:
                     text_parts.append(translatable_text)
                 continue
@@ -584,34 +1133,36 @@ class TranslatorEngine:
             if inner_text:
                 translatable_text = TranslatorEngine._extract_translatable_text_from_node(element)
                 can_translate = bool(translatable_text)
-                segments.append({
-                    "type": "text",
-                    "tag": tag_name,
-                    "text": translatable_text if can_translate else inner_text,
-                    "html": str(element),
-                    "attrs": dict(element.attrs) if hasattr(element, 'attrs') else {},
-                    "translate": can_translate,
-                    "contains_media": contains_media,
-                })
+                segments.append(Segment(
+                    type="text",
+                    tag=tag_name,
+                    text=translatable_text if can_translate else inner_text,
+                    html=str(element),
+                    attrs=element.attrs,
+                    translate=can_translate,
+                    contains_media=contains_media,
+                ))
                 if can_translate:
                     text_parts.append(translatable_text)
             else:
-                segments.append({
-                    "type": "skip",
-                    "tag": tag_name,
-                    "text": "",
-                    "html": str(element),
-                    "attrs": dict(element.attrs) if hasattr(element, 'attrs') else {},
-                    "translate": False,
-                    "contains_media": contains_media,
-                })
+                segments.append(Segment(
+                    type="skip",
+                    tag=tag_name,
+                    text="",
+                    html=str(element),
+                    attrs=element.attrs,
+                    translate=False,
+                    contains_media=contains_media,
+                ))
 
         plain_text = "\n".join(text_parts)
         return plain_text, segments
 
-    @staticmethod
-    def _is_heading_tag(tag_name: str) -> bool:
-        return bool(tag_name and re.fullmatch(r"h[1-6]", str(tag_name).lower()))
+    _HEADING_TAG_RE = re.compile(r"h[1-6]")
+
+    @classmethod
+    def _is_heading_tag(cls, tag_name: str) -> bool:
+        return bool(tag_name and cls._HEADING_TAG_RE.fullmatch(str(tag_name).lower()))
 
     @staticmethod
     def _has_heading_ancestor(node) -> bool:
@@ -675,12 +1226,14 @@ class TranslatorEngine:
         chunks.append(text[cursor:])
         return chunks
 
+    _LINE_BREAK_WS_RE = re.compile(r"\s*\n\s*")
+
     @staticmethod
     def _inject_translation_into_segment_html(segment_html: str, translated_text: str) -> str:
         if not segment_html:
             return ""
 
-        normalized = re.sub(r"\s*\n\s*", "", (translated_text or "").strip())
+        normalized = TranslatorEngine._LINE_BREAK_WS_RE.sub("", (translated_text or "").strip())
         if not normalized:
             return segment_html
 
@@ -697,8 +1250,9 @@ class TranslatorEngine:
         chunks = TranslatorEngine._split_text_by_lengths(normalized, lengths)
         for node, chunk in zip(text_nodes, chunks):
             original = str(node)
-            prefix = re.match(r"^\s*", original).group(0) if original else ""
-            suffix = re.search(r"\s*$", original).group(0) if original else ""
+            # 保留原文本节点首尾的空白
+            prefix = original[:len(original) - len(original.lstrip())]
+            suffix = original[len(original.rstrip()):]
             node.replace_with(NavigableString(f"{prefix}{chunk}{suffix}"))
 
         return "".join(str(x) for x in container.contents)
@@ -717,6 +1271,10 @@ class TranslatorEngine:
         """
         if not original_html or not translated_text:
             return original_html
+
+        # 绝大多数段落不含注音，无需为查找 ruby 标签先解析一遍
+        if "<ruby" not in original_html.lower():
+            return TranslatorEngine._inject_translation_into_segment_html(original_html, translated_text)
         
         # 解析原始HTML以保留Ruby结构
         soup = BeautifulSoup(original_html, "html.parser")
@@ -809,7 +1367,7 @@ class TranslatorEngine:
         return " " + " ".join(rendered)
 
     @staticmethod
-    def rebuild_chapter_html(segments: list[dict], translated_text: str, original_html: str = "") -> str:
+    def rebuild_chapter_html(segments: list["Segment"], translated_text: str, original_html: str = "") -> str:
         """将翻译结果回注到原始 HTML 结构中。
 
         策略：按段落顺序将翻译文本填回对应的 segment，
@@ -819,10 +1377,10 @@ class TranslatorEngine:
         expected_segments = sum(
             1
             for seg in segments
-            if seg.get("type") in ("text", "heading") and seg.get("translate", True)
+            if seg.type in ("text", "heading") and seg.translate
         )
         if expected_segments <= 0:
-            return "\n".join(seg.get("html", "") for seg in segments)
+            return "\n".join(seg.html for seg in segments)
 
         if len(trans_paragraphs) > expected_segments:
             if expected_segments == 1:
@@ -835,57 +1393,58 @@ class TranslatorEngine:
         result_parts = []
 
         for seg in segments:
-            if seg["type"] in ("image", "skip"):
+            if seg.type in ("image", "skip"):
                 # 非文本元素原样保留，但确保图片路径正确
-                html_content = seg["html"]
+                html_content = seg.html
                 # 修复图片路径引用（确保相对路径正确）
-                if seg["type"] == "image" and 'src="' in html_content:
+                if seg.type == "image" and 'src="' in html_content:
                     # 保持原始图片路径不变，但验证路径格式
                     pass
                 result_parts.append(html_content)
-            elif seg["type"] in ("text", "heading"):
-                if not seg.get("translate", True):
-                    result_parts.append(seg["html"])
+            elif seg.type in ("text", "heading"):
+                if not seg.translate:
+                    result_parts.append(seg.html)
                     continue
                 if trans_idx < len(trans_paragraphs):
                     trans_content = trans_paragraphs[trans_idx]
                     # 使用新的Ruby标签保留功能
                     rebuilt = TranslatorEngine._preserve_ruby_annotations(
-                        seg.get("html", ""), trans_content
+                        seg.html, trans_content
                     )
-                    result_parts.append(rebuilt if rebuilt else seg["html"])
+                    result_parts.append(rebuilt if rebuilt else seg.html)
                     trans_idx += 1
                 else:
                     # 翻译段落不足，保留原文
-                    result_parts.append(seg["html"])
+                    result_parts.append(seg.html)
             else:
-                result_parts.append(seg["html"])
+                result_parts.append(seg.html)
 
         # 兼容兜底：若仍有剩余段落，追加到末尾
         while trans_idx < len(trans_paragraphs):
-            extra = trans_paragraphs[trans_idx].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            extra = html.escape(trans_paragraphs[trans_idx], quote=False)
             result_parts.append(f"<p>{extra}</p>")
             trans_idx += 1
 
         return "\n".join(result_parts)
 
-    @staticmethod
-    def _extract_chapter_order_key(filename: str):
+    _CHAPTER_NUM_RE = re.compile(r"\d+")
+    _SPECIAL_DOC_NAMES = frozenset({"nav.xhtml", "toc.xhtml", "cover.xhtml"})
+
+    @classmethod
+    def _extract_chapter_order_key(cls, filename: str):
         """从文件名中提取排序键"""
         basename = os.path.basename(filename).lower()
-        if basename in ("nav.xhtml", "toc.xhtml", "cover.xhtml"):
+        if basename in cls._SPECIAL_DOC_NAMES:
             return (0, 0)
-        m = re.search(r"(\d+)", basename)
+        m = cls._CHAPTER_NUM_RE.search(basename)
         if m:
-            return (1, int(m.group(1)))
+            return (1, int(m.group()))
         return (2, 0)
 
-    @staticmethod
-    def _sort_chapters_data(chapters_data: list) -> list:
-        return sorted(
-            chapters_data,
-            key=lambda x: TranslatorEngine._extract_chapter_order_key(x[0]),
-        )
+    @classmethod
+    def _sort_chapters_data(cls, chapters_data: list) -> list:
+        key = cls._extract_chapter_order_key
+        return sorted(chapters_data, key=lambda x: key(x[0]))
 
     @staticmethod
     def _extract_chapter_title(content: str, fallback_index=None):
@@ -908,6 +1467,8 @@ class TranslatorEngine:
         title = TranslatorEngine._strip_leading_xx_dot(title)
         return title, content.strip()
 
+    _XX_DOT_PREFIX_RE = re.compile(r'^\s*(?:[A-Za-z0-9_\-]{1,12}[\.．\-])+\s*')
+
     @staticmethod
     def _strip_leading_xx_dot(title: str) -> str:
         """移除标题开头的 ASCII/数字/连字符等前缀并随 dot 的模式，例如: '01. ', 'Vol.01-', 'AB.' 等。
@@ -917,7 +1478,7 @@ class TranslatorEngine:
         if not title:
             return title
         # 匹配一个或多个以字母/数字/连字符/下划线组成的段，后接点或点与连字符，然后删除
-        new = re.sub(r'^\s*(?:[A-Za-z0-9_\-]{1,12}[\.．\-])+\s*', '', title)
+        new = TranslatorEngine._XX_DOT_PREFIX_RE.sub('', title)
         return new.strip()
 
     def split_text(self, text: str) -> list[str]:
@@ -926,28 +1487,63 @@ class TranslatorEngine:
         max_chars = self.config.chunk_size
         if max_chars <= 0:
             return [text.strip()]
-        paragraphs = text.split("\n")
+        # 按段落累计长度切分：维护当前块段落列表与累计长度（含换行），每块只 join 一次
         chunks = []
-        current_chunk = ""
-        for p in paragraphs:
+        current: list[str] = []
+        current_len = 0
+        for p in text.split("\n"):
             p = p.strip()
             if not p:
                 continue
-            if len(current_chunk) + len(p) > max_chars and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = p + "\n"
-            else:
-                current_chunk += p + "\n"
-        if current_chunk:
-            chunks.append(current_chunk)
+            if current and current_len + len(p) > max_chars:
+                chunks.append("\n".join(current) + "\n")
+                current = []
+                current_len = 0
+            current.append(p)
+            current_len += len(p) + 1
+        if current:
+            chunks.append("\n".join(current) + "\n")
         return chunks
 
     # ── 翻译核心 ──
 
-    def translate_chunk(self, text: str, prev_context: str = "") -> str:
+    def _translation_cache(self) -> Optional[CheckpointManager]:
+        if self._bypass_translation_cache or not self.config.enable_checkpoint:
+            return None
+        return self.checkpoint
+
+    def _get_llm_cache(self) -> Optional[LLMCache]:
+        if not self.config.enable_llm_cache or self._bypass_translation_cache:
+            return None
+        if self._llm_cache is None:
+            try:
+                self._llm_cache = LLMCache()
+            except Exception as e:
+                self.log(f"⚠️ LLM 缓存不可用: {e}")
+                self.config.enable_llm_cache = False
+                return None
+        return self._llm_cache
+
+    def _llm_cache_key(self, user_content: str, assistant_prefix: str) -> str:
+        c = self.config
+        return LLMCache.make_key(
+            c.provider, c.base_url, c.model_name, c.model_type,
+            c.temperature, c.top_p, c.max_tokens, c.frequency_penalty, c.presence_penalty,
+            self.system_prompt, user_content, assistant_prefix,
+        )
+
+    def translate_chunk(self, text: str, prev_context: str = "", *, raw: bool = False) -> str:
+        """翻译单个分块；raw=True 时跳过回显清理，由调用方自行拆分/清理（合并请求用）"""
         if not text.strip():
             return ""
 
+        # 命中分块译文缓存则直接返回，不发起 API 请求
+        cache = self._translation_cache()
+        if cache:
+            cached = cache.get_translation(text, self.config.model_name)
+            if cached:
+                return cached
+
         # 构建用户内容（带上下文）
         if prev_context:
             user_content = (
@@ -958,8 +1554,20 @@ class TranslatorEngine:
         else:
             user_content = text
 
+        llm_cache = self._get_llm_cache()
+        llm_key = ""
+        if llm_cache:
+            llm_key = self._llm_cache_key(user_content, self._get_assistant_prefix())
+            hit = llm_cache.get(llm_key)
+            if hit:
+                if cache:
+                    cache.put_translation(text, self.config.model_name, "zh", hit)
+                return hit
+
+        backoff = RateLimiter.BASE_DELAY
         for attempt in range(self.config.retry_count):
             self._pause_event.wait()
+            self._rate_limiter.wait(lambda: self.progress.is_cancelled)
             if self.progress.is_cancelled:
                 return "[翻译已取消]"
             try:
@@ -968,6 +1576,9 @@ class TranslatorEngine:
                     acc: list[str] = []
 
                     def _stream_cb(chunk: str):
+                        # 取消后返回 False，让 provider 立即中止流式响应
+                        if self.progress.is_cancelled:
+                            return False
                         try:
                             acc.append(chunk)
                             if self.on_stream:
@@ -977,9 +1588,13 @@ class TranslatorEngine:
                                 self.log(chunk)
                         except Exception:
                             pass
+                        return True
 
                     assistant_pref = self._get_assistant_prefix()
                     result = self.provider.translate(self.system_prompt, user_content, assistant_prefix=assistant_pref, stream=True, stream_callback=_stream_cb)
+                    if self.progress.is_cancelled:
+                        # 中途取消的残缺译文不写入缓存
+                        return "[翻译已取消]"
                     # 如果 provider 返回了最终合并结果，优先使用；否则合并 acc
                     if not result and acc:
                         result = "".join(acc)
@@ -987,12 +1602,15 @@ class TranslatorEngine:
                     assistant_pref = self._get_assistant_prefix()
                     result = self.provider.translate(self.system_prompt, user_content, assistant_prefix=assistant_pref)
                 # 尝试清理模型可能回显的提示词/术语表/原文，防止注入到最终译文中
-                try:
-                    cleaned = self._clean_model_output(result, text)
-                except Exception:
+                if raw:
                     cleaned = result
+                else:
+                    try:
+                        cleaned = self._clean_model_output(result, text)
+                    except Exception:
+                        cleaned = result
                 # 若检测到回显，回退到非前缀续写再试一次
-                if self._looks_like_prompt_echo(cleaned, text):
+                if not raw and self._looks_like_prompt_echo(cleaned, text):
                     self.log("⚠️ 检测到提示词/术语表回显，尝试回退模式重试一次")
                     fallback = self._fallback_translate_without_prefix(user_content)
                     if fallback:
@@ -1001,22 +1619,42 @@ class TranslatorEngine:
                         except Exception:
                             cleaned_fb = fallback
                         if not self._looks_like_prompt_echo(cleaned_fb, text):
-                            return cleaned_fb
+                            cleaned = cleaned_fb
+                            if cache and cleaned:
+                                cache.put_translation(text, self.config.model_name, "zh", cleaned)
+                            if llm_cache and cleaned:
+                                llm_cache.set(llm_key, cleaned)
+                            return cleaned
+                    return cleaned
+                if cache and cleaned:
+                    cache.put_translation(text, self.config.model_name, "zh", cleaned)
+                if llm_cache and cleaned:
+                    llm_cache.set(llm_key, cleaned)
                 return cleaned
             except Exception as e:
                 err_detail = self._format_api_error(e)
                 self.log(f"⚠️ API 调用失败 (尝试 {attempt+1}/{self.config.retry_count}): {err_detail}")
                 if attempt < self.config.retry_count - 1:
-                    wait = 2 * (attempt + 1)
+                    backoff = RateLimiter.next_backoff(backoff)
+                    wait = backoff
                     retry_after = self._get_retry_after(e)
                     if retry_after:
                         wait = max(wait, retry_after)
                         self.log(f"⏳ 服务端要求等待 {retry_after}s (retry-after)")
-                    time.sleep(wait)
+                    if retry_after or getattr(e, "status_code", None) == 429:
+                        # 限速：所有并发线程一起暂停，由下一轮循环开头的 wait() 等待
+                        self._rate_limiter.penalize(wait)
+                    else:
+                        time.sleep(wait)
                 else:
                     return f"\n[翻译失败: {err_detail}]\n"
         return "[翻译失败: 未知错误]"
 
+    _TRANSLATION_LABEL_RE = re.compile(r"(?:^|\n)\s*[\[【]?\s*译文\s*[\]】]?\s*[:：]?\s*")
+    _REQUIREMENTS_BLOCK_RE = re.compile(r"翻译要求[:：\s\S]*?(?:\n\s*\n)")
+    _LEADING_DECOR_RE = re.compile(r'^[\s\-_=#\*\[\]]+')
+    _EXTRA_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
     def _clean_model_output(self, result: str, original_text: str) -> str:
         """
         清理模型输出中可能被回显的提示词、术语表或原文。
@@ -1045,7 +1683,7 @@ class TranslatorEngine:
     
         # 检测并修复中日文混杂问题
         # 如果检测到大量日文字符，记录日文比例但不过度干预
-        japanese_chars = sum(1 for c in text if '\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff')
+        japanese_chars = len(self._CJK_KANA_RE.findall(text))
         total_chars = len(text.strip())
             
         if total_chars > 0 and japanese_chars / total_chars > 0.3:
@@ -1054,7 +1692,7 @@ class TranslatorEngine:
     
         # 优先截取最后一个"译文"标记之后的内容（兼容多种写法）
         m_last = None
-        for m in re.finditer(r"(?:^|\n)\s*[\[【]?\s*译文\s*[\]】]?\s*[:：]?\s*", text):
+        for m in self._TRANSLATION_LABEL_RE.finditer(text):
             m_last = m
         if m_last:
             text = text[m_last.end():]
@@ -1102,13 +1740,13 @@ class TranslatorEngine:
             pass
     
         # 删除常见提示区域（例如以 '翻译要求' 开头的一段）
-        text = re.sub(r"翻译要求[:：\s\S]*?(?:\n\s*\n)", "", text)
+        text = self._REQUIREMENTS_BLOCK_RE.sub("", text)
     
         # 去除前导分割符与多余符号
-        text = re.sub(r'^[\s\-_=#\*\[\]]+', '', text).strip()
+        text = self._LEADING_DECOR_RE.sub('', text).strip()
     
         # 收敛多余空行
-        text = re.sub(r"\n{3,}", "\n\n", text).strip()
+        text = self._EXTRA_BLANK_LINES_RE.sub("\n\n", text).strip()
     
         # 检查清理后的文本是否为空，如果为空则返回原始结果
         if not text.strip():
@@ -1179,15 +1817,52 @@ class TranslatorEngine:
 
     # ── 章节读取 ──
 
+    def _read_source_book(self):
+        """读取源 EPUB。
+
+        同一引擎内读取章节后写出 EPUB 时会再次用到源文件（复制 CSS/图片/字体），
+        文件未变化时直接复用已解析的 book，避免整本书再解压、解析并驻留一份。
+        """
+        path = self.config.input_file
+        key = self._file_key(path)
+        if self._source_book is None or self._source_book[0] != key:
+            self._source_book = (key, epub.read_epub(path))
+            self._chapter_segments = {}
+        return self._source_book[1]
+
+    @staticmethod
+    def _file_key(path: str) -> tuple:
+        """(绝对路径, mtime, 大小)：文件内容是否变化的廉价判据"""
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
     def get_chapters(self) -> list[ChapterInfo]:
+        """解析源 EPUB 的有效章节。
+
+        解析结果按文件缓存在本引擎上（见 `_chapters_cache`），同一文件未变化时
+        质量扫描、重翻、重新导出等操作不再重复解压和解析。每次调用返回新的
+        ChapterInfo，但其 `content` 与缓存共用同一字符串，调用方应视为只读。
+        """
         if not os.path.exists(self.config.input_file):
             raise FileNotFoundError(f"未找到文件: {self.config.input_file}")
-        book = epub.read_epub(self.config.input_file)
+        key = self._file_key(self.config.input_file)
+        if self._chapters_cache is not None and self._chapters_cache[0] == key:
+            parsed = self._chapters_cache[1]
+        else:
+            parsed = self._parse_chapters(self._read_source_book())
+            self._chapters_cache = (key, parsed)
+        # 分段留给写出 EPUB 时复用；原始 HTML 可随时从 item 取回，无需重复保存
+        self._chapter_segments = {name: segments for _, name, _, _, segments in parsed}
+        return [ChapterInfo(index, name, text, item) for index, name, text, item, _ in parsed]
+
+    def _parse_chapters(self, book) -> list[tuple]:
+        """解析全部文档，返回 [(序号, 名称, 纯文本, item, 分段)]"""
+        # 逐项迭代文档，不额外物化整本书的 item 列表
         try:
-            items = list(book.get_items_of_type(ebooklib.ITEM_DOCUMENT))
+            items = book.get_items_of_type(ebooklib.ITEM_DOCUMENT)
         except (KeyError, AttributeError):
-            items = [x for x in book.get_items() if x.get_type() == ebooklib.ITEM_DOCUMENT]
-        chapters = []
+            items = (x for x in book.get_items() if x.get_type() == ebooklib.ITEM_DOCUMENT)
+        parsed = []
         seen_names = set()
         for idx, item in enumerate(items):
             name = item.get_name()
@@ -1206,11 +1881,10 @@ class TranslatorEngine:
             seen_names.add(name)
             raw_content = item.get_content()
             html_str = raw_content.decode('utf-8', errors='replace') if isinstance(raw_content, bytes) else str(raw_content)
-            clean_text, _ = self.parse_html_structured(html_str)
+            clean_text, segments = self.parse_html_structured(html_str)
             if len(clean_text) >= 50:
-                # 同时存储原始 HTML 以便后续结构保留
-                chapters.append(ChapterInfo(idx + 1, name, clean_text, item, html_content=html_str))
-        return chapters
+                parsed.append((idx + 1, name, clean_text, item, segments))
+        return parsed
 
     # ── 上下文注入 ──
 
@@ -1219,54 +1893,201 @@ class TranslatorEngine:
             n_lines = self.config.context_lines
         if not text or n_lines <= 0:
             return ""
-        lines = [l.strip() for l in text.strip().split("\n") if l.strip()]
-        filtered = [l for l in lines if not self._is_non_story_meta_line(l)]
-        if filtered:
-            lines = filtered
-        tail = lines[-n_lines:] if len(lines) > n_lines else lines
+        # 从末尾逐行反向扫描，凑够 n 行正文即停止，不切分整段译文
+        story: list[str] = []
+        fallback: list[str] = []
+        end = len(text)
+        while end >= 0 and len(story) < n_lines:
+            start = text.rfind("\n", 0, end)
+            line = text[start + 1:end].strip()
+            end = start
+            if not line:
+                continue
+            if len(fallback) < n_lines:
+                fallback.append(line)
+            if not self._is_non_story_meta_line(line):
+                story.append(line)
+        # 全部为非正文行时，退回使用最后 n 个非空行
+        tail = story or fallback
+        tail.reverse()
         return "\n".join(tail)
 
     # ── 分块翻译 ──
 
+    # ── 短章节合并请求 ──
+
+    _BATCH_MARKER = "### 段落 {}"
+    _BATCH_MARKER_RE = re.compile(r"^[ \t]*#{2,}[ \t]*段落[ \t]*(\d+)[ \t]*$", re.MULTILINE)
+
+    def _translate_batch(self, texts: list[str], prev_ctx: str = "") -> Optional[list[str]]:
+        """把多段短原文合并为一次请求翻译，按段落标记拆回各段。
+
+        译文段数或编号与原文不符时返回 None，由调用方逐段回退。
+        """
+        body = "\n".join(
+            f"{self._BATCH_MARKER.format(n)}\n{t.strip()}" for n, t in enumerate(texts, start=1)
+        )
+        request = (
+            f"[以下原文共 {len(texts)} 段，请逐段翻译，并原样保留每段前的「### 段落 N」标记行]\n"
+            f"{body}"
+        )
+        # 整体清理会把与原文相同的标记行一并删掉，因此取原始输出，拆分后逐段清理
+        result = self.translate_chunk(request, prev_context=prev_ctx, raw=True)
+        pieces = self._BATCH_MARKER_RE.split(result or "")
+        # split 结果: [标记前内容, 编号1, 译文1, 编号2, 译文2, ...]
+        if pieces[1::2] != [str(n) for n in range(1, len(texts) + 1)]:
+            return None
+        parts = []
+        for part, src in zip(pieces[2::2], texts):
+            try:
+                part = self._clean_model_output(part.strip(), src)
+            except Exception:
+                part = part.strip()
+            if not part:
+                return None
+            parts.append(part)
+        return parts
+
+    def _prefetch_short_chapters(
+        self, chapters: list[ChapterInfo], start: int, first_chunk: str, prev_ctx: str,
+        splits: dict[int, list[str]],
+    ) -> dict[int, Optional[str]]:
+        """从 start 起收集连续的未缓存短章节（各自仅一个分块）合并翻译。
+
+        返回 {章节下标: 译文}；不足两章时返回空字典，合并翻译失败时译文为 None，
+        两种情况都按常规逐章翻译。探查后续章节时的分块结果存入 splits，供主循环复用。
+        """
+        limit = self.config.batch_chapters
+        max_chars = self.config.chunk_size
+        if limit <= 1 or max_chars <= 0:
+            return {}
+        indices = [start]
+        texts = [first_chunk]
+        total = len(first_chunk)
+        for j in range(start + 1, len(chapters)):
+            if len(indices) >= limit:
+                break
+            ch = chapters[j]
+            if self.checkpoint and self.config.enable_checkpoint and self.checkpoint.lookup_chapter(ch.name) is not None:
+                break
+            chunks = splits.get(j)
+            if chunks is None:
+                chunks = splits[j] = self.split_text(ch.content)
+            if len(chunks) != 1 or total + len(chunks[0]) > max_chars:
+                break
+            indices.append(j)
+            texts.append(chunks[0])
+            total += len(chunks[0])
+        if len(indices) < 2:
+            return {}
+        parts = self._translate_batch(texts, prev_ctx)
+        if parts is None:
+            self.log(f"⚠️ 合并请求的译文无法按段落拆分，回退为逐章翻译 ({len(indices)} 章)")
+            # 记为 None：这些章节按常规翻译，不再参与合并
+            return dict.fromkeys(indices)
+        self.log(f"📎 已合并翻译 {len(indices)} 个短章节")
+        return dict(zip(indices, parts))
+
+    def _get_executor(self, workers: int) -> ThreadPoolExecutor:
+        """获取（必要时创建）并发线程池，线程数变化时重建；章节并发时多个线程共用"""
+        old = None
+        with self._lock:
+            if self._executor is None or self._executor_workers != workers:
+                old = self._executor
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate")
+                self._executor_workers = workers
+            executor = self._executor
+        if old is not None:
+            # 锁外等待旧线程池收尾：其任务完成时需要 self._lock 记录进度
+            old.shutdown(wait=True)
+        return executor
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_workers = 0
+
+    PROGRESS_INTERVAL = 0.1  # on_progress 最短触发间隔（秒），即至多 10 Hz
+
+    def _emit_progress(self, force: bool = False):
+        """更新已用时间并触发 on_progress；非 force 时限频，避免缓存章节回放时刷屏"""
+        now = time.monotonic()
+        if not force and now - self._last_progress_emit < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress_emit = now
+        if self.progress.start_time:
+            self.progress.elapsed_time = now - self.progress.start_time
+        if self.on_progress:
+            self.on_progress(self.progress)
+
+    def _account_chunk(self, result: str):
+        """记录一个分块完成（并发线程共用）"""
+        with self._lock:
+            self.progress.current_chunk += 1
+            self.progress.translated_chars += len(result)
+        self._emit_progress()
+
     def _translate_chunks(self, chunks: list[str], initial_prev_ctx: str = "") -> list[str]:
         results = [None] * len(chunks)
         context_lines = self.config.context_lines
+        _account = self._account_chunk
 
         def _do(index, chunk_text, prev_ctx=""):
             result = self.translate_chunk(chunk_text, prev_context=prev_ctx)
-            with self._lock:
-                self.progress.current_chunk += 1
-                self.progress.translated_chars += len(result)
-            if self.on_progress:
-                self.on_progress(self.progress)
+            _account(result)
             return index, result
 
+        # 本轮内相同的 (上下文, 分块) 只请求一次，重复项直接共享结果（进度仍按分块计数）
         workers = min(self.config.concurrent_workers, len(chunks))
         if workers <= 1:
             prev_ctx = initial_prev_ctx if context_lines > 0 else ""
+            memo: dict[tuple[str, str], str] = {}
             for i, chunk in enumerate(chunks):
+                # 暂停在分块间即生效，不必等整章译完；未暂停时 wait() 立即返回
+                self._pause_event.wait()
                 if self.progress.is_cancelled:
                     break
-                idx, result = _do(i, chunk, prev_ctx)
-                results[idx] = result
+                key = (prev_ctx, chunk)
+                if key in memo:
+                    result = memo[key]
+                    _account(result)
+                else:
+                    _, result = _do(i, chunk, prev_ctx)
+                    memo[key] = result
+                results[i] = result
                 prev_ctx = self._get_context_tail(result, context_lines)
         else:
             if context_lines > 0:
                 self.log("💡 并发模式下上下文注入仅在批次间生效")
             batch_prev_ctx = initial_prev_ctx if context_lines > 0 else ""
             for batch_start in range(0, len(chunks), workers):
+                self._pause_event.wait()
+                if self.progress.is_cancelled:
+                    break
                 batch_end = min(batch_start + workers, len(chunks))
                 batch = list(enumerate(chunks[batch_start:batch_end], start=batch_start))
-                with ThreadPoolExecutor(max_workers=workers) as executor:
-                    futures = {}
-                    for j, (i, c) in enumerate(batch):
-                        ctx = batch_prev_ctx if (j == 0 and context_lines > 0) else ""
-                        futures[executor.submit(_do, i, c, ctx)] = i
-                    for future in as_completed(futures):
-                        if self.progress.is_cancelled:
-                            break
-                        idx, result = future.result()
+                executor = self._get_executor(self.config.concurrent_workers)
+                futures: dict = {}
+                submitted: dict[tuple[str, str], object] = {}
+                for j, (i, c) in enumerate(batch):
+                    ctx = batch_prev_ctx if (j == 0 and context_lines > 0) else ""
+                    future = submitted.get((ctx, c))
+                    if future is None:
+                        future = executor.submit(_do, i, c, ctx)
+                        submitted[(ctx, c)] = future
+                        futures[future] = [i]
+                    else:
+                        futures[future].append(i)
+                for future in as_completed(futures):
+                    if self.progress.is_cancelled:
+                        break
+                    _, result = future.result()
+                    indices = futures[future]
+                    for idx in indices:
                         results[idx] = result
+                    for _ in indices[1:]:
+                        _account(result)
                 last_result = results[batch_end - 1]
                 if last_result:
                     batch_prev_ctx = self._get_context_tail(last_result, context_lines)
@@ -1275,19 +2096,31 @@ class TranslatorEngine:
 
     # ── 输出写入 ──
 
-    def _write_txt(self, output_path: str, chapters_data: list):
+    def _write_output(self, output_path: str, chapters_data: list, fmt: str) -> Optional[int]:
+        """按格式写出译文，返回文件字节数；文件未生成时返回 None"""
+        if fmt == "epub":
+            written = self._write_epub(output_path, chapters_data)
+        else:
+            written = self._write_txt(output_path, chapters_data)
+        if written is None and os.path.exists(output_path):
+            written = os.path.getsize(output_path)
+        return written
+
+    def _write_txt(self, output_path: str, chapters_data: list) -> int:
+        """写出 TXT，返回写入的字节数"""
         sorted_data = self._sort_chapters_data(chapters_data)
-        with open(output_path, "w", encoding="utf-8") as f:
+        rule = "=" * 40
+        # 逐章直接写入 1 MiB 缓冲区，不在内存中拼接整本书
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
             for i, (filename, content) in enumerate(sorted_data):
                 title, body = self._extract_chapter_title(content, fallback_index=i + 1)
-                f.write(f"\n{'='*40}\n")
-                f.write(f"  {title}\n")
-                f.write(f"{'='*40}\n\n")
+                f.write(f"\n{rule}\n  {title}\n{rule}\n\n")
                 f.write(body)
                 f.write("\n\n")
+            return f.tell()
 
-    def _write_epub(self, output_path: str, chapters_data: list):
-        """生成 EPUB 输出。
+    def _write_epub(self, output_path: str, chapters_data: list) -> Optional[int]:
+        """生成 EPUB 输出，返回文件字节数（生成失败时为 None）。
 
         如果有原始 EPUB 源文件，将复制其 CSS/图片/字体/元数据，
         并将翻译结果注入对应章节的 HTML 中，保留原始样式。
@@ -1299,7 +2132,7 @@ class TranslatorEngine:
         source_book = None
         if self.config.input_file and os.path.exists(self.config.input_file):
             try:
-                source_book = epub.read_epub(self.config.input_file)
+                source_book = self._read_source_book()
             except Exception:
                 pass
 
@@ -1439,9 +2272,9 @@ class TranslatorEngine:
         # 如果有原始书籍，尝试保留原始章节结构
         if source_book:
             try:
-                source_docs = list(source_book.get_items_of_type(ebooklib.ITEM_DOCUMENT))
+                source_docs = source_book.get_items_of_type(ebooklib.ITEM_DOCUMENT)
             except (KeyError, AttributeError):
-                source_docs = [x for x in source_book.get_items() if x.get_type() == ebooklib.ITEM_DOCUMENT]
+                source_docs = (x for x in source_book.get_items() if x.get_type() == ebooklib.ITEM_DOCUMENT)
 
             chapter_idx = 0
             for item in source_docs:
@@ -1453,7 +2286,17 @@ class TranslatorEngine:
                     # 尝试在原始 HTML 结构中替换文本
                     raw = item.get_content()
                     html_str = raw.decode('utf-8', errors='replace') if isinstance(raw, bytes) else str(raw)
-                    orig_soup = BeautifulSoup(html_str, "html.parser")
+                    segments = self._chapter_segments.pop(name, None)
+                    if segments is None:
+                        orig_soup = BeautifulSoup(html_str, _BS4_PARSER)
+                        _, segments = self._parse_soup_structured(orig_soup)
+                    else:
+                        # 正文分段已在读取章节时解析过，这里只需 <head>（标题 / 样式链接）：
+                        # 先用正则截出 <head> 片段再解析，避免对整章正文做一次词法扫描
+                        m = self._HEAD_RE.search(html_str)
+                        orig_soup = BeautifulSoup(
+                            m.group() if m else html_str, _BS4_PARSER, parse_only=self._HEAD_STRAINER
+                        )
                     original_doc_title = getattr(item, "title", None) or ""
                     if not original_doc_title:
                         title_tag = orig_soup.find("title")
@@ -1462,8 +2305,6 @@ class TranslatorEngine:
                     if not original_doc_title:
                         original_doc_title = os.path.splitext(os.path.basename(name))[0]
 
-                    _, segments = self.parse_html_structured(html_str)
-
                     if segments:
                         # 结构保留模式：将翻译文本回注到原始 HTML 结构
                         translated_body_html = self.rebuild_chapter_html(
@@ -1482,7 +2323,7 @@ class TranslatorEngine:
                         if 'lang=' not in head_html:
                             head_html = head_html.replace('<head>', '<head lang="zh">')
                     else:
-                        safe_title = original_doc_title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+                        safe_title = html.escape(original_doc_title, quote=False)
                         head_html = f'<head lang="zh"><meta charset="utf-8"/><title>{safe_title}</title></head>'
 
                     # 确保HTML结构完整且编码正确
@@ -1514,7 +2355,7 @@ class TranslatorEngine:
             for i, (filename, content) in enumerate(sorted_data):
                 display_title, body = self._extract_chapter_title(content, fallback_index=i + 1)
                 html_body = self._text_to_html_paragraphs(body)
-                safe_title = display_title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+                safe_title = html.escape(display_title, quote=False)
 
                 ch = epub.EpubHtml(
                     title=display_title,
@@ -1605,8 +2446,10 @@ class TranslatorEngine:
                     
             except Exception as e:
                 self.log(f"   ⚠️ 无法验证EPUB内容: {str(e)[:50]}")
+            return file_size
         else:
             self.log("❌ EPUB文件生成失败")
+            return None
 
     @staticmethod
     def _text_to_html_paragraphs(text: str) -> str:
@@ -1616,7 +2459,7 @@ class TranslatorEngine:
         for p in paragraphs:
             p = p.strip()
             if p:
-                p = p.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+                p = html.escape(p, quote=False)
                 html_parts.append(f"<p>{p}</p>")
         return "\n".join(html_parts)
 
@@ -1653,9 +2496,9 @@ class TranslatorEngine:
         allowed = {
             'provider', 'api_key', 'base_url', 'model_name', 'model_type',
             'temperature', 'top_p', 'frequency_penalty', 'presence_penalty', 'max_tokens',
-            'chunk_size', 'concurrent_workers', 'retry_count',
+            'chunk_size', 'concurrent_workers', 'chapter_workers', 'retry_count', 'batch_chapters',
             'output_file', 'output_format', 'glossary_file',
-            'start_chapter', 'end_chapter', 'custom_prompt', 'context_lines',
+            'start_chapter', 'end_chapter', 'custom_prompt', 'context_lines', 'enable_llm_cache',
             'deepseek_beta', 'use_prefix_completion', 'use_fim_completion', 'stream_logs'
         }
 
@@ -1675,11 +2518,166 @@ class TranslatorEngine:
             self.log(f"ℹ️ 配置文件 {path} 无可更新项")
             return False
 
+    def _assemble_chapter(self, chapter: ChapterInfo, translated_parts: list[str]) -> str:
+        """合并一章的分块译文"""
+        # 过滤掉空的翻译部分，但保留非空部分
+        filtered_parts = [part for part in translated_parts if part and part.strip()]
+
+        if filtered_parts:
+            # 如果有非空的翻译部分，连接它们
+            return "\n".join(filtered_parts)
+        # 如果所有部分都是空的，至少记录一个警告信息
+        self.log(f"⚠️ 章节 '{chapter.name}' 的所有翻译块都为空，保留原始内容以避免数据丢失")
+        # 使用原始内容作为占位符，避免完全空白
+        return f"[翻译失败或为空 - 章节: {chapter.name}]\n{chapter.content[:200]}..." if chapter.content else f"[翻译失败或为空 - 章节: {chapter.name}]"
+
+    def _translate_chapters_sequential(self, target_chapters: list[ChapterInfo]) -> list[tuple[str, str]]:
+        """逐章翻译，上一章译文末尾作为下一章的上下文，返回 [(章节名, 译文)]"""
+        chapters_data = []
+        chapter_prev_ctx = ""
+        # 短章节合并请求预先取得的译文：{章节下标: 译文或 None(合并失败)}
+        batched: dict[int, Optional[str]] = {}
+        # 合并探查时已切好的后续章节分块：{章节下标: 分块}
+        splits: dict[int, list[str]] = {}
+
+        for i, chapter in enumerate(target_chapters):
+            if self.progress.is_cancelled:
+                self.log("❌ 翻译已取消")
+                break
+
+            self._pause_event.wait()
+
+            self.progress.current_chapter = i + 1
+            self.progress.current_chapter_name = chapter.name
+            self.progress.current_chunk = 0
+
+            cached = (
+                self.checkpoint.lookup_chapter(chapter.name)
+                if self.config.enable_checkpoint and self.checkpoint
+                else None
+            )
+            if cached is not None:
+                chapters_data.append((chapter.name, cached))
+                self.log(f"⏩ [{i+1}/{len(target_chapters)}] {chapter.name} (已缓存)")
+                self.progress.translated_chars += len(cached)
+                if self.config.context_lines > 0 and cached:
+                    chapter_prev_ctx = self._get_context_tail(cached, self.config.context_lines)
+                chapter.release_content()
+                self._emit_progress()
+                continue
+
+            if self.on_chapter_start:
+                self.on_chapter_start(chapter)
+            self.log(f"📝 [{i+1}/{len(target_chapters)}] {chapter.name}")
+
+            chunks = splits.pop(i, None)
+            if chunks is None:
+                chunks = self.split_text(chapter.content)
+            self.progress.total_chunks = len(chunks)
+            if i not in batched and len(chunks) == 1:
+                batched.update(self._prefetch_short_chapters(
+                    target_chapters, i, chunks[0],
+                    chapter_prev_ctx if self.config.context_lines > 0 else "",
+                    splits,
+                ))
+            prefetched = batched.pop(i, None)
+            if prefetched is not None:
+                translated_parts = [prefetched]
+                self._account_chunk(prefetched)
+            else:
+                translated_parts = self._translate_chunks(chunks, initial_prev_ctx=chapter_prev_ctx)
+                if self.progress.is_cancelled:
+                    # 中途取消的章节不写入断点，下次续传时重译
+                    self.log("❌ 翻译已取消")
+                    break
+            translated_content = self._assemble_chapter(chapter, translated_parts)
+
+            chapters_data.append((chapter.name, translated_content))
+            if self.config.context_lines > 0 and translated_content:
+                chapter_prev_ctx = self._get_context_tail(translated_content, self.config.context_lines)
+
+            if self.config.enable_checkpoint and self.checkpoint:
+                self.checkpoint.mark_chapter_done(chapter.name, translated_content)
+            chapter.release_content()
+
+            self._emit_progress()
+
+        self._emit_progress(force=True)
+        return chapters_data
+
+    def _translate_chapters_parallel(self, target_chapters: list[ChapterInfo]) -> list[tuple[str, str]]:
+        """章节级并发：同时翻译 chapter_workers 个章节，按原顺序返回 [(章节名, 译文)]。
+
+        各章独立翻译，不注入上一章的上下文；章内分块仍按 concurrent_workers 并发。
+        """
+        total = len(target_chapters)
+        results: dict[int, tuple[str, str]] = {}
+        pending = []
+        for i, chapter in enumerate(target_chapters):
+            cached = (
+                self.checkpoint.lookup_chapter(chapter.name)
+                if self.config.enable_checkpoint and self.checkpoint
+                else None
+            )
+            if cached is None:
+                pending.append((i, chapter))
+                continue
+            results[i] = (chapter.name, cached)
+            self.log(f"⏩ [{i+1}/{total}] {chapter.name} (已缓存)")
+            self.progress.translated_chars += len(cached)
+            chapter.release_content()
+        self.progress.current_chapter = len(results)
+        self._emit_progress(force=True)
+        if not pending:
+            return [results[i] for i in sorted(results)]
+
+        if self.config.context_lines > 0:
+            self.log("💡 章节并发模式下不注入上一章的上下文")
+        self.log(f"⚡ 章节并发: {self.config.chapter_workers} 章")
+        with ThreadPoolExecutor(max_workers=self.config.chapter_workers, thread_name_prefix="chapter") as pool:
+            futures = {
+                pool.submit(self._translate_chapter_task, i, total, chapter): (i, chapter)
+                for i, chapter in pending
+            }
+            for future in as_completed(futures):
+                i, chapter = futures[future]
+                translated_content = future.result()
+                if translated_content is None:
+                    continue
+                results[i] = (chapter.name, translated_content)
+                self.progress.current_chapter = len(results)
+                self.progress.current_chapter_name = chapter.name
+                self._emit_progress()
+        self._emit_progress(force=True)
+        if self.progress.is_cancelled:
+            self.log("❌ 翻译已取消")
+        return [results[i] for i in sorted(results)]
+
+    def _translate_chapter_task(self, i: int, total: int, chapter: ChapterInfo) -> Optional[str]:
+        """章节并发的工作线程：翻译单章并写入断点；已取消时返回 None"""
+        if self.progress.is_cancelled:
+            return None
+        self._pause_event.wait()
+        if self.on_chapter_start:
+            self.on_chapter_start(chapter)
+        self.log(f"📝 [{i+1}/{total}] {chapter.name}")
+        translated_parts = self._translate_chunks(self.split_text(chapter.content))
+        if self.progress.is_cancelled:
+            # 中途取消的章节不写入断点，下次续传时重译
+            return None
+        translated_content = self._assemble_chapter(chapter, translated_parts)
+        if self.config.enable_checkpoint and self.checkpoint:
+            self.checkpoint.mark_chapter_done(chapter.name, translated_content)
+        chapter.release_content()
+        return translated_content
+
     def _run_translation(self):
         try:
             self.progress = TranslationProgress()
             self.progress.is_running = True
-            self.progress.start_time = time.time()
+            self.progress.start_time = time.monotonic()
+            self._last_progress_emit = 0.0
+            self._bypass_translation_cache = False
 
             self._init_provider()
             self.glossary = self.load_glossary()
@@ -1687,6 +2685,8 @@ class TranslatorEngine:
 
             self.log(f"📖 正在读取: {os.path.basename(self.config.input_file)}")
             chapters = self.get_chapters()
+            # 逐章 release_content() 要能真正释放原文，本次运行不再保留章节缓存
+            self._chapters_cache = None
             self.log(f"📚 共 {len(chapters)} 个有效章节")
 
             start = max(0, self.config.start_chapter - 1) if self.config.start_chapter > 0 else 0
@@ -1733,68 +2733,16 @@ class TranslatorEngine:
                     self.log(f"📌 断点续传: 已完成 {done} 章，自动跳过")
 
             output_dir = os.path.dirname(self.config.output_file)
-            if output_dir and not os.path.exists(output_dir):
+            if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
 
-            chapters_data = []
-            chapter_prev_ctx = ""
-
-            for i, chapter in enumerate(target_chapters):
-                if self.progress.is_cancelled:
-                    self.log("❌ 翻译已取消")
-                    break
-
-                self._pause_event.wait()
-
-                self.progress.current_chapter = i + 1
-                self.progress.current_chapter_name = chapter.name
-                self.progress.current_chunk = 0
-
-                if (
-                    self.config.enable_checkpoint
-                    and self.checkpoint
-                    and self.checkpoint.is_chapter_done(chapter.name)
-                ):
-                    cached = self.checkpoint.get_chapter_result(chapter.name)
-                    chapters_data.append((chapter.name, cached))
-                    self.log(f"⏩ [{i+1}/{len(target_chapters)}] {chapter.name} (已缓存)")
-                    self.progress.translated_chars += len(cached)
-                    if self.config.context_lines > 0 and cached:
-                        chapter_prev_ctx = self._get_context_tail(cached, self.config.context_lines)
-                    self.progress.elapsed_time = time.time() - self.progress.start_time
-                    if self.on_progress:
-                        self.on_progress(self.progress)
-                    continue
-
-                if self.on_chapter_start:
-                    self.on_chapter_start(chapter)
-                self.log(f"📝 [{i+1}/{len(target_chapters)}] {chapter.name}")
-
-                chunks = self.split_text(chapter.content)
-                self.progress.total_chunks = len(chunks)
-                translated_parts = self._translate_chunks(chunks, initial_prev_ctx=chapter_prev_ctx)
-                # 过滤掉空的翻译部分，但保留非空部分
-                filtered_parts = [part for part in translated_parts if part and part.strip()]
-                
-                if filtered_parts:
-                    # 如果有非空的翻译部分，连接它们
-                    translated_content = "\n".join(filtered_parts)
-                else:
-                    # 如果所有部分都是空的，至少记录一个警告信息
-                    self.log(f"⚠️ 章节 '{chapter.name}' 的所有翻译块都为空，保留原始内容以避免数据丢失")
-                    # 使用原始内容作为占位符，避免完全空白
-                    translated_content = f"[翻译失败或为空 - 章节: {chapter.name}]\n{chapter.content[:200]}..." if chapter.content else f"[翻译失败或为空 - 章节: {chapter.name}]"
-                
-                chapters_data.append((chapter.name, translated_content))
-                if self.config.context_lines > 0 and translated_content:
-                    chapter_prev_ctx = self._get_context_tail(translated_content, self.config.context_lines)
-
-                if self.config.enable_checkpoint and self.checkpoint:
-                    self.checkpoint.mark_chapter_done(chapter.name, translated_content)
+            if self.config.chapter_workers > 1:
+                chapters_data = self._translate_chapters_parallel(target_chapters)
+            else:
+                chapters_data = self._translate_chapters_sequential(target_chapters)
 
-                self.progress.elapsed_time = time.time() - self.progress.start_time
-                if self.on_progress:
-                    self.on_progress(self.progress)
+            if self.config.enable_checkpoint and self.checkpoint:
+                self.checkpoint.flush()
 
             # 检查是否实际有内容被翻译和写入文件
             output_written = False
@@ -1804,19 +2752,15 @@ class TranslatorEngine:
                 # 记录章节数据的详细信息
                 for i, (filename, content) in enumerate(chapters_data):
                     content_len = len(content) if content else 0
-                    japanese_chars = sum(1 for c in content if '\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff') if content else 0
+                    japanese_chars = len(self._CJK_KANA_RE.findall(content)) if content else 0
                     ratio = japanese_chars / content_len if content_len > 0 else 0
                     self.log(f"   章节 {i+1}: '{filename}' - 长度 {content_len}, 日文字符比例 {ratio:.2%}")
                 
-                if fmt == "epub":
-                    self._write_epub(self.config.output_file, chapters_data)
-                else:
-                    self._write_txt(self.config.output_file, chapters_data)
+                output_size = self._write_output(self.config.output_file, chapters_data, fmt)
                 self.log(f"✅ 已保存: {self.config.output_file}")
                 
                 # 检查输出文件是否真的被创建且有内容
-                if os.path.exists(self.config.output_file):
-                    output_size = os.path.getsize(self.config.output_file)
+                if output_size is not None:
                     self.log(f"📊 输出文件大小: {output_size} 字节")
                     if output_size > 0:
                         output_written = True
@@ -1828,7 +2772,7 @@ class TranslatorEngine:
                 self.log(f"⚠️ 未写入输出文件 - 翻译取消: {self.progress.is_cancelled}, 章节数据: {len(chapters_data) if chapters_data else 0}")
 
             self.progress.is_running = False
-            self.progress.elapsed_time = time.time() - self.progress.start_time
+            self.progress.elapsed_time = time.monotonic() - self.progress.start_time
 
             # 仅当实际有内容翻译并写入文件时才触发完成回调
             if not self.progress.is_cancelled and output_written and self.progress.translated_chars > 0:
@@ -1848,10 +2792,11 @@ class TranslatorEngine:
         except Exception as e:
             self.progress.is_running = False
             self.log(f"❌ 翻译出错: {e}")
-            import traceback
             self.log(traceback.format_exc())
             if self.on_error:
                 self.on_error(str(e))
+        finally:
+            self._shutdown_executor()
 
     # ── 控制 ──
 
@@ -1924,8 +2869,7 @@ class TranslatorEngine:
         if not checkpoint_path or not os.path.exists(checkpoint_path):
             return None
         try:
-            with open(checkpoint_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = CheckpointManager.read_file(checkpoint_path)
             return data.get("completed_chapters", {}), data.get("config_hash", "")
         except Exception:
             return None
@@ -1966,11 +2910,8 @@ class TranslatorEngine:
 
         fmt = output_format.lower()
         self.log(f"📦 正在生成 {fmt.upper()} 文件（共 {len(chapters_data)} 章）: {output_path}")
-        if fmt == "epub":
-            self._write_epub(output_path, chapters_data)
-        else:
-            self._write_txt(output_path, chapters_data)
-        self.log(f"✅ 已保存: {output_path} ({os.path.getsize(output_path)} bytes)")
+        written = self._write_output(output_path, chapters_data, fmt)
+        self.log(f"✅ 已保存: {output_path} ({written} bytes)")
         return True
 
     # ============== 翻译修复 (Quality Scan & Retranslation) ==============
@@ -1995,17 +2936,56 @@ class TranslatorEngine:
             return {}
 
         completed, _ = info
+        count_keywords = self._make_keyword_counter(rules)
         issues = {}
         for ch_name, text in completed.items():
-            ch_issues = []
-            for keyword, hint in rules.items():
-                count = text.count(keyword)
-                if count > 0:
-                    ch_issues.append((keyword, count, hint))
+            counts = count_keywords(text)
+            ch_issues = [
+                (keyword, counts[keyword], hint)
+                for keyword, hint in rules.items()
+                if counts[keyword] > 0
+            ]
             if ch_issues:
                 issues[ch_name] = ch_issues
         return issues
 
+    @staticmethod
+    def _make_keyword_counter(keywords) -> Callable[[str], dict]:
+        """构建 text -> {关键词: 出现次数} 的计数函数。
+
+        计数语义与 `str.count` 一致（同一关键词的匹配互不重叠，不同关键词各自计数）；
+        安装 pyahocorasick 时所有关键词共用一个自动机，每章只扫描一遍。
+        否则先取章节的字符集合，含有章节中未出现字符的关键词直接记 0，不再逐个 count。
+        """
+        keywords = list(keywords)
+        words = [kw for kw in keywords if kw]
+        if _ahocorasick is None or not words:
+            kw_chars = {kw: frozenset(kw) for kw in keywords}
+
+            def count_plain(text: str) -> dict:
+                chars = set(text)
+                return {kw: text.count(kw) if kw_chars[kw] <= chars else 0 for kw in keywords}
+
+            return count_plain
+
+        automaton = _ahocorasick.Automaton()
+        for kw in words:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+
+        def count(text: str) -> dict:
+            counts = {kw: text.count(kw) for kw in keywords if not kw}
+            counts.update(dict.fromkeys(words, 0))
+            next_start = dict.fromkeys(words, 0)
+            for end, kw in automaton.iter(text):
+                start = end - len(kw) + 1
+                if start >= next_start[kw]:
+                    counts[kw] += 1
+                    next_start[kw] = end + 1
+            return counts
+
+        return count
+
     def retranslate_chapters(
         self,
         checkpoint_path: str,
@@ -2019,12 +2999,13 @@ class TranslatorEngine:
             self.log("❌ 断点文件不存在")
             return False
 
+        cp = CheckpointManager.from_checkpoint_file(checkpoint_path)
         try:
-            with open(checkpoint_path, "r", encoding="utf-8") as f:
-                cp_data = json.load(f)
+            cp_data = cp.read_file(checkpoint_path)
         except Exception as e:
             self.log(f"❌ 加载断点失败: {e}")
             return False
+        cp.data = cp_data
 
         completed = cp_data.get("completed_chapters", {})
         if not completed:
@@ -2038,12 +3019,14 @@ class TranslatorEngine:
         all_chapters = self.get_chapters()
         name_to_chapter = {ch.name: ch for ch in all_chapters}
 
-        valid_names = [n for n in chapter_names if n in name_to_chapter and n in completed]
+        # 一次遍历同时分出有效/无效章节（dict 成员判断即为 O(1)，无需再构造集合）
+        valid_names, skipped = [], []
+        for n in dict.fromkeys(chapter_names):
+            (valid_names if n in name_to_chapter and n in completed else skipped).append(n)
         if not valid_names:
             self.log("❌ 指定的章节均不在断点中或源文件中找不到")
             return False
 
-        skipped = set(chapter_names) - set(valid_names)
         if skipped:
             self.log(f"⚠️ 跳过 {len(skipped)} 个无效章节: {', '.join(skipped)}")
 
@@ -2054,6 +3037,9 @@ class TranslatorEngine:
         self.system_prompt = self.build_system_prompt(self.glossary)
         self.progress.is_cancelled = False
 
+        # 重翻需要新的译文，不读取分块缓存（_run_translation 开始时会复位）
+        self._bypass_translation_cache = True
+
         for idx, ch_name in enumerate(valid_names):
             if self.progress.is_cancelled:
                 self.log("❌ 重翻已取消")
@@ -2083,12 +3069,13 @@ class TranslatorEngine:
             else:
                 translated_parts = self._translate_chunks(chunks)
             translated_content = "\n".join(translated_parts)
-            completed[ch_name] = translated_content
+            # 只向日志追加重翻的章节，不重写整份快照（读取时日志覆盖快照中的旧译文）
+            cp.mark_chapter_done(ch_name, translated_content)
 
-        cp_data["completed_chapters"] = completed
+        self._shutdown_executor()
+        self._bypass_translation_cache = False
         try:
-            with open(checkpoint_path, "w", encoding="utf-8") as f:
-                json.dump(cp_data, f, ensure_ascii=False, indent=2)
+            cp.sync()
             self.log(f"💾 断点已更新: {checkpoint_path}")
         except Exception as e:
             self.log(f"❌ 保存断点失败: {e}")
@@ -2098,11 +3085,8 @@ class TranslatorEngine:
             chapters_data = list(completed.items())
             fmt = output_format.lower()
             self.log(f"📦 正在生成 {fmt.upper()} 文件（共 {len(chapters_data)} 章）: {output_path}")
-            if fmt == "epub":
-                self._write_epub(output_path, chapters_data)
-            else:
-                self._write_txt(output_path, chapters_data)
-            self.log(f"✅ 已保存: {output_path} ({os.path.getsize(output_path)} bytes)")
+            written = self._write_output(output_path, chapters_data, fmt)
+            self.log(f"✅ 已保存: {output_path} ({written} bytes)")
 
         self.log(f"✅ 重翻完成! 共 {len(valid_names)} 章")
         return True
@@ -353,7 +353,7 @@ def main(page: ft.Page):
             pct = progress.current_chapter / progress.total_chapters
             progress_bar.value = pct
             progress_text.value = f"{progress.current_chapter}/{progress.total_chapters} 章"
-            elapsed = time.time() - progress.start_time
+            elapsed = time.monotonic() - progress.start_time
             if elapsed > 0 and progress.current_chapter > 0:
                 speed = progress.translated_chars / elapsed
                 remaining = progress.total_chapters - progress.current_chapter
@@ -11,6 +11,7 @@ novel_translator.providers - AI Provider 抽象层
 
 import re
 import logging
+import functools
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
@@ -114,6 +115,7 @@ class AIProvider(ABC):
     def translate(self, system_prompt: str, user_content: str, assistant_prefix: str | None = None, *, stream: bool = False, stream_callback=None) -> str:
         """
         发送翻译请求，返回翻译结果文本。
+        stream=True 时逐块调用 stream_callback，回调返回 False 可提前中止。
         出错时应抛出异常。
         """
         ...
@@ -131,6 +133,49 @@ class AIProvider(ABC):
         return self.__class__.__name__
 
 
+# ===== 共享 HTTP 连接池 =====
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client():
+    """进程内共享的 httpx.Client（线程安全，按目标主机各自维护连接池）。
+
+    每次开始翻译 / 测试连接 / 重翻都会新建 Provider；共用同一个客户端可以
+    复用已建立的 keep-alive 连接，免去重复的 TCP + TLS 握手。
+    安装了 h2 时启用 HTTP/2，多个并发线程可复用同一条连接。
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    try:
+        from openai import DefaultHttpxClient
+        return DefaultHttpxClient(http2=http2)
+    except ImportError:
+        import httpx
+        return httpx.Client(http2=http2, follow_redirects=True)
+
+
+# ===== 流式输出辅助 =====
+
+def _emit_stream_chunk(stream_callback, chunk: str) -> bool:
+    """把增量片段交给回调；回调显式返回 False 表示中止本次流式响应"""
+    try:
+        return stream_callback(chunk) is not False
+    except Exception:
+        return True
+
+
+def _close_stream(resp):
+    """提前关闭流式响应，释放底层连接，不再接收剩余 token"""
+    close = getattr(resp, "close", None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
+
+
 # ===== OpenAI 兼容 Provider =====
 
 class OpenAIProvider(AIProvider):
@@ -169,6 +214,7 @@ class OpenAIProvider(AIProvider):
         self._client = OpenAI(
             api_key=self.api_key,
             base_url=effective_url,
+            http_client=_shared_http_client(),
         )
         self._resolved_type = self._resolve_model_type()
 
@@ -264,11 +310,9 @@ class OpenAIProvider(AIProvider):
                             pass
                     if chunk:
                         accumulated.append(chunk)
-                        if stream_callback:
-                            try:
-                                stream_callback(chunk)
-                            except Exception:
-                                pass
+                        if stream_callback and not _emit_stream_chunk(stream_callback, chunk):
+                            _close_stream(resp)
+                            break
             except Exception:
                 # 如果迭代失败，兼容回退为一次性请求
                 resp = self._client.chat.completions.create(
@@ -354,11 +398,9 @@ class OpenAIProvider(AIProvider):
                             pass
                     if chunk:
                         accumulated.append(chunk)
-                        if stream_callback:
-                            try:
-                                stream_callback(chunk)
-                            except Exception:
-                                pass
+                        if stream_callback and not _emit_stream_chunk(stream_callback, chunk):
+                            _close_stream(resp)
+                            break
             except Exception:
                 resp = self._client.chat.completions.create(
                     model=self.model_name,
@@ -430,11 +472,9 @@ class OpenAIProvider(AIProvider):
                         pass
                     if chunk:
                         accumulated.append(chunk)
-                        if stream_callback:
-                            try:
-                                stream_callback(chunk)
-                            except Exception:
-                                pass
+                        if stream_callback and not _emit_stream_chunk(stream_callback, chunk):
+                            _close_stream(resp)
+                            break
             except Exception:
                 resp = self._client.completions.create(
                     model=self.model_name,
@@ -497,11 +537,9 @@ class OpenAIProvider(AIProvider):
                         pass
                     if chunk:
                         accumulated.append(chunk)
-                        if stream_callback:
-                            try:
-                                stream_callback(chunk)
-                            except Exception:
-                                pass
+                        if stream_callback and not _emit_stream_chunk(stream_callback, chunk):
+                            _close_stream(resp)
+                            break
             except Exception:
                 resp = self._client.completions.create(
                     model=self.model_name,
@@ -733,7 +771,8 @@ def create_provider(
             Fill In the Middle 模式，优先级高于 use_prefix_completion
         其他参数传递给 Provider 构造器
     Returns:
-        AIProvider 实例
+        新建的 AIProvider 实例。TranslatorEngine 在 API 配置不变时会复用同一实例，
+        调用方不要修改其属性；需要改动时先 copy.copy() 一份
     Raises:
         ValueError: 不支持的 provider_type
         ImportError: 缺少必要的 SDK